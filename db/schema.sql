@@ -39,6 +39,43 @@ CREATE TABLE IF NOT EXISTS facts (
   UNIQUE (cik, taxonomy, tag, unit, period_start, period_end, value, filed)
 );
 
+-- Per-company ingest state, so interrupted runs can resume
+CREATE TABLE IF NOT EXISTS ingest_checkpoints (
+  cik TEXT PRIMARY KEY REFERENCES companies(cik),
+  status TEXT NOT NULL,        -- 'done' | 'failed'
+  last_fetched_at TIMESTAMPTZ,
+  payload_hash TEXT,           -- sha256 of the companyfacts JSON
+  facts_hash TEXT,             -- sha256 of the CORE_TAGS subset
+  max_filed DATE,              -- latest `filed` among ingested facts
+  extract_key TEXT,            -- extraction rules the hashes were computed under
+  filings_count INT,           -- size of the last full extraction (not the delta written)
+  facts_count INT,
+  error TEXT,
+  attempts INT NOT NULL DEFAULT 0,  -- consecutive failures
+  next_retry_at TIMESTAMPTZ,
+  updated_at TIMESTAMPTZ DEFAULT now()
+);
+
+ALTER TABLE ingest_checkpoints ADD COLUMN IF NOT EXISTS facts_hash TEXT;
+ALTER TABLE ingest_checkpoints ADD COLUMN IF NOT EXISTS max_filed DATE;
+ALTER TABLE ingest_checkpoints ADD COLUMN IF NOT EXISTS extract_key TEXT;
+
+-- Companies whose upstream data changed and that a downstream stage still has to rebuild
+CREATE TABLE IF NOT EXISTS dirty_companies (
+  cik TEXT NOT NULL REFERENCES companies(cik),
+  stage TEXT NOT NULL,         -- 'statements' | 'ratios' | 'rollups'
+  marked_at TIMESTAMPTZ DEFAULT now(),
+  PRIMARY KEY (cik, stage)
+);
+
+-- Peer groups a company left (sector/industry re-classified): rollups recompute them without it
+CREATE TABLE IF NOT EXISTS dirty_peer_groups (
+  group_kind TEXT NOT NULL,    -- 'sector' | 'industry'
+  group_name TEXT NOT NULL,
+  marked_at TIMESTAMPTZ DEFAULT now(),
+  PRIMARY KEY (group_kind, group_name)
+);
+
 -- Annual normalized statement (wide-ish table for quick ratios)
 CREATE TABLE IF NOT EXISTS statements_annual (
   cik TEXT NOT NULL REFERENCES companies(cik),
@@ -62,6 +99,17 @@ CREATE TABLE IF NOT EXISTS statements_annual (
   PRIMARY KEY (cik, fiscal_year)
 );
 
+-- Values are converted to `currency` (USD); this is what the filer reported in
+ALTER TABLE statements_annual ADD COLUMN IF NOT EXISTS reporting_currency TEXT DEFAULT 'USD';
+
+-- USD value of one unit of `currency`, loaded from a local CSV (sec_xbrl_finwarehouse load-fx)
+CREATE TABLE IF NOT EXISTS fx_rates (
+  currency TEXT NOT NULL,      -- ISO 4217, e.g. "EUR"
+  rate_date DATE NOT NULL,
+  usd_per_unit NUMERIC NOT NULL,
+  PRIMARY KEY (currency, rate_date)
+);
+
 CREATE INDEX IF NOT EXISTS idx_facts_cik_tag_end ON facts (cik, tag, period_end);
 CREATE INDEX IF NOT EXISTS idx_filings_cik_date ON filings (cik, filing_date);
 
@@ -77,4 +125,22 @@ CREATE TABLE IF NOT EXISTS ratios_annual (
   fcf_margin DOUBLE PRECISION,
   asset_turnover DOUBLE PRECISION,
   PRIMARY KEY (cik, fiscal_year)
-);
\ No newline at end of file
+);
+
+-- Peer-group aggregates of ratios_annual, one row per (group, fiscal_year, metric)
+CREATE TABLE IF NOT EXISTS peer_ratio_stats (
+  group_kind TEXT NOT NULL,    -- 'sector' | 'industry'
+  group_name TEXT NOT NULL,
+  fiscal_year INT NOT NULL,
+  metric TEXT NOT NULL,        -- ratios_annual column name
+  n INT NOT NULL,
+  mean DOUBLE PRECISION,
+  p25 DOUBLE PRECISION,
+  median DOUBLE PRECISION,
+  p75 DOUBLE PRECISION,
+  updated_at TIMESTAMPTZ DEFAULT now(),
+  PRIMARY KEY (group_kind, group_name, fiscal_year, metric)
+);
+
+-- Screener sorts by (fiscal_year DESC, roe DESC NULLS LAST)
+CREATE INDEX IF NOT EXISTS idx_ratios_fy_roe ON ratios_annual (fiscal_year DESC, roe DESC NULLS LAST);
@@ -0,0 +1,76 @@
+import argparse
+import os
+import subprocess
+import sys
+import time
+from typing import List, Tuple
+
+# Cold-start benchmark: each target runs in a fresh interpreter, best of N, minus bare startup.
+TARGETS = (
+    ("cli --help", ["-m", "sec_xbrl_finwarehouse", "--help"]),
+    ("import cli", ["-c", "import sec_xbrl_finwarehouse.cli"]),
+    ("import pipeline.seed", ["-c", "import sec_xbrl_finwarehouse.pipeline.seed"]),
+    ("import pipeline.ingest", ["-c", "import sec_xbrl_finwarehouse.pipeline.ingest"]),
+    ("import pipeline.fx_rates", ["-c", "import sec_xbrl_finwarehouse.pipeline.fx_rates"]),
+    ("import pipeline.statements", ["-c", "import sec_xbrl_finwarehouse.pipeline.statements"]),
+    ("import pipeline.ratios", ["-c", "import sec_xbrl_finwarehouse.pipeline.ratios"]),
+    ("import pipeline.rollups", ["-c", "import sec_xbrl_finwarehouse.pipeline.rollups"]),
+    ("import api", ["-c", "import sec_xbrl_finwarehouse.api"]),
+)
+
+# Must not be imported just to parse the command line
+HEAVY = ("requests", "psycopg2", "fastapi", "uvicorn", "numpy", "orjson", "dotenv")
+
+def _env() -> dict:
+    env = dict(os.environ)
+    src = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+    env["PYTHONPATH"] = src + os.pathsep + env.get("PYTHONPATH", "")
+    return env
+
+def _time(args: List[str], repeat: int) -> Tuple[float, bool]:
+    best = float("inf")
+    ok = True
+    for _ in range(repeat):
+        start = time.perf_counter()
+        r = subprocess.run([sys.executable, *args], env=_env(), capture_output=True)
+        best = min(best, time.perf_counter() - start)
+        ok = ok and r.returncode == 0
+    return best * 1000.0, ok
+
+def heavy_modules_loaded_by_cli() -> List[str]:
+    code = (
+        "import sys, sec_xbrl_finwarehouse.cli as c; c.build_parser(); "
+        f"print(','.join(m for m in {HEAVY!r} if m in sys.modules))"
+    )
+    out = subprocess.run([sys.executable, "-c", code], env=_env(), capture_output=True, text=True, check=True)
+    return [m for m in out.stdout.strip().split(",") if m]
+
+def main():
+    p = argparse.ArgumentParser(description="Measure cold-start import times of the CLI and API.")
+    p.add_argument("--repeat", type=int, default=5)
+    p.add_argument("--budget-ms", type=float, default=None,
+                   help="fail if `cli --help` takes longer than this (above bare interpreter startup)")
+    args = p.parse_args()
+
+    baseline, _ = _time(["-c", "pass"], args.repeat)
+    print(f"{'python -c pass':32s} {baseline:8.1f} ms (baseline, subtracted below)")
+
+    results = {}
+    for name, target in TARGETS:
+        ms, ok = _time(target, args.repeat)
+        results[name] = ms - baseline
+        status = "" if ok else "  (failed: missing dependency?)"
+        print(f"{name:32s} {ms - baseline:8.1f} ms{status}")
+
+    heavy = heavy_modules_loaded_by_cli()
+    if heavy:
+        print(f"❌ CLI parsing imported heavy modules: {', '.join(heavy)}")
+        raise SystemExit(1)
+    print("✅ CLI parsing imports no heavy dependencies")
+
+    if args.budget_ms is not None and results["cli --help"] > args.budget_ms:
+        print(f"❌ cli --help over budget: {results['cli --help']:.1f} ms > {args.budget_ms:.1f} ms")
+        raise SystemExit(1)
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,4 @@
-import os
-from dotenv import load_dotenv
-import psycopg2
+from sec_xbrl_finwarehouse.db import get_conn
 
 TAGS = {
     "revenues": "Revenues",
@@ -15,12 +13,8 @@ TAGS = {
 }
 
 def main():
-    load_dotenv()
-    db_url = os.getenv("DATABASE_URL")
-    if not db_url:
-        raise ValueError("Missing DATABASE_URL in .env")
-
-    with psycopg2.connect(db_url) as conn:
+    # Settings (.env) load once; get_conn() checks DATABASE_URL and profiles queries
+    with get_conn() as conn:
         with conn.cursor() as cur:
             # For each filing (accession), we have fiscal_year/fiscal_period in filings.
             # We want annual rows (fp = 'FY') primarily.
@@ -83,7 +77,7 @@ def main():
                 )
             )
 
-        with psycopg2.connect(db_url) as conn:
+        with get_conn() as conn:
             with conn.cursor() as cur:
                 cur.executemany("""
                     INSERT INTO statements_annual (
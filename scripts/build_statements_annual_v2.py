@@ -1,32 +1,14 @@
-import os
-from dotenv import load_dotenv
-import psycopg2
+from sec_xbrl_finwarehouse.concepts import COMPILED, field_tags
+from sec_xbrl_finwarehouse.db import get_conn
 
-REVENUE_CANDIDATES = (
-    "Revenues",
-    "SalesRevenueNet",
-    "RevenueFromContractWithCustomerExcludingAssessedTax",
-    "TotalRevenues",
-)
+# Same concept registry (default group) as the V3 builder
+REVENUE_CANDIDATES = field_tags("revenues")
 
-TAG_MAP = {
-    "gross_profit": ("GrossProfit",),
-    "operating_income": ("OperatingIncomeLoss",),
-    "net_income": ("NetIncomeLoss",),
-    "total_assets": ("Assets",),
-    "total_liabilities": ("Liabilities",),
-    "total_equity": ("StockholdersEquity",),
-    "operating_cash_flow": ("NetCashProvidedByUsedInOperatingActivities",),
-    "capex": ("PaymentsToAcquirePropertyPlantAndEquipment",),
-}
+TAG_MAP = {f: field_tags(f) for f in COMPILED.fields if f != "revenues"}
 
 def main():
-    load_dotenv()
-    db_url = os.getenv("DATABASE_URL")
-    if not db_url:
-        raise ValueError("Missing DATABASE_URL in .env")
-
-    with psycopg2.connect(db_url) as conn:
+    # Settings (.env) load once; get_conn() checks DATABASE_URL and profiles queries
+    with get_conn() as conn:
         with conn.cursor() as cur:
             # Pull ONE best value per (cik, fiscal_year, tag) with priority to 10-K
             cur.execute("""
@@ -100,7 +82,7 @@ def main():
                 )
             )
 
-        with psycopg2.connect(db_url) as conn:
+        with get_conn() as conn:
             with conn.cursor() as cur:
                 cur.executemany("""
                     INSERT INTO statements_annual (
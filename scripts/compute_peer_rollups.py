@@ -0,0 +1,7 @@
+import sys
+
+from sec_xbrl_finwarehouse.cli import main
+
+# Kept for existing invocations; same as: sec_xbrl_finwarehouse rollups
+if __name__ == "__main__":
+    sys.exit(main(["rollups", *sys.argv[1:]]))
@@ -1,63 +1,207 @@
-from fastapi import FastAPI, HTTPException, Query
-from .db import get_conn
+from collections import deque
+from typing import Iterable, Iterator, Optional, Sequence
 
-app = FastAPI(title="SEC XBRL FinWarehouse", version="0.1.0")
+from fastapi import FastAPI, HTTPException, Query, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+from . import serialization
+from .config import get_settings
+from .db import get_conn, profile_queries
+from .peers import PEERS_SQL, RATIO_METRICS
+from .snapshot import SnapshotHolder
+from .symbols import SymbolIndex
+
+class FastJSONResponse(JSONResponse):
+    """JSON body encoded with serialization.dumps: orjson when installed (pip install -e .[fast])."""
+
+    def render(self, content) -> bytes:
+        return serialization.dumps(content)
+
+app = FastAPI(title="SEC XBRL FinWarehouse", version="0.1.0", default_response_class=FastJSONResponse)
+
+# Per-request query breakdowns are only exposed when explicitly enabled
+QUERY_DEBUG = get_settings().query_debug
+_recent_profiles: deque = deque(maxlen=50)
+
+# Ticker resolution and search are served from memory (loaded lazily on first use)
+symbols = SymbolIndex()
+
+# Read-only mmap of the latest published ratios (shared page cache across workers); None -> Postgres
+snapshots = SnapshotHolder(get_settings().ratios_snapshot_path)
+
+# Streamed bodies run their queries after the handler returns (see _db_batches)
+_STREAMED_MEDIA_TYPES = (serialization.NDJSON_MEDIA_TYPE, serialization.CSV_MEDIA_TYPE)
+
+@app.middleware("http")
+async def query_profile_middleware(request: Request, call_next):
+    with profile_queries() as profile:
+        response = await call_next(request)
+
+    if response.headers.get("content-type") in _STREAMED_MEDIA_TYPES:
+        # Headers are sent before the body queries run: no counts in them, record once drained
+        response.body_iterator = _record_when_drained(response.body_iterator, request, response.status_code, profile)
+        return response
+
+    response.headers["X-Query-Count"] = str(profile.count)
+    response.headers["Server-Timing"] = f"db;dur={profile.total_ms:.1f}"
+    _record_profile(request, response.status_code, profile)
+    return response
+
+async def _record_when_drained(body, request: Request, status: int, profile):
+    try:
+        async for chunk in body:
+            yield chunk
+    finally:
+        _record_profile(request, status, profile)
+
+def _record_profile(request: Request, status: int, profile) -> None:
+    if QUERY_DEBUG and request.url.path != "/debug/queries":
+        _recent_profiles.append(
+            {
+                "method": request.method,
+                "path": request.url.path,
+                "query": str(request.url.query),
+                "status": status,
+                "count": profile.count,
+                "total_ms": round(profile.total_ms, 3),
+                "queries": profile.summary(),
+            }
+        )
+
+# Rows per server-side cursor fetch / per streamed chunk
+STREAM_BATCH_ROWS = 1000
+
+RATIO_COLUMNS = ("fiscal_year",) + RATIO_METRICS
+SCREENER_COLUMNS = ("ticker", "name", "fiscal_year", "roe", "fcf_margin", "net_margin")
+
+FORMAT_QUERY = Query("json", pattern="^(json|ndjson|csv)$")
+
+def _json_limit(fmt: str, limit: Optional[int], default: int, maximum: int) -> Optional[int]:
+    # Streaming formats are unbounded unless asked; the buffered JSON body stays capped
+    if fmt != "json":
+        return limit
+    if limit is None:
+        return default
+    if limit > maximum:
+        raise HTTPException(status_code=422, detail=f"limit must be <= {maximum} for format=json (use ndjson or csv)")
+    return limit
+
+def _db_batches(sql: str, params: Sequence) -> Iterator[list]:
+    """Yield result rows in STREAM_BATCH_ROWS chunks from a server-side cursor."""
+    # Runs inside the response body iterator, after the handler returned: owns its connection
+    conn = get_conn()
+    try:
+        with conn.cursor(name="api_stream") as cur:
+            cur.execute(sql, params)
+            while True:
+                rows = cur.fetchmany(STREAM_BATCH_ROWS)
+                if not rows:
+                    break
+                yield rows
+    finally:
+        conn.close()
+
+def _chunks(rows: list) -> Iterator[list]:
+    for i in range(0, len(rows), STREAM_BATCH_ROWS):
+        yield rows[i : i + STREAM_BATCH_ROWS]
+
+def _stream(fmt: str, columns: Sequence[str], batches: Iterable[list]) -> StreamingResponse:
+    if fmt == "csv":
+        return StreamingResponse(serialization.csv_batches(columns, batches), media_type=serialization.CSV_MEDIA_TYPE)
+    return StreamingResponse(serialization.ndjson_batches(columns, batches), media_type=serialization.NDJSON_MEDIA_TYPE)
+
+@app.get("/debug/queries", include_in_schema=False)
+def debug_queries():
+    if not QUERY_DEBUG:
+        raise HTTPException(status_code=404, detail="Not Found")
+    return {"requests": list(reversed(_recent_profiles))}
 
 @app.get("/company/{ticker}")
 def company(ticker: str):
-    ticker = ticker.upper()
-    with get_conn() as conn:
-        with conn.cursor() as cur:
-            cur.execute(
-                "SELECT cik, ticker, name FROM companies WHERE ticker=%s",
-                (ticker,),
-            )
-            row = cur.fetchone()
-    if not row:
+    c = symbols.get(ticker)
+    if not c:
         raise HTTPException(status_code=404, detail="Ticker not found")
-    cik, ticker, name = row
-    return {"cik": cik, "ticker": ticker, "name": name}
+    return {"cik": c.cik, "ticker": c.ticker, "name": c.name, "sector": c.sector, "industry": c.industry}
+
+@app.get("/search")
+def search(q: str = Query(..., min_length=1), limit: int = Query(10, ge=1, le=50)):
+    return {
+        "results": [
+            {"cik": c.cik, "ticker": c.ticker, "name": c.name}
+            for c in symbols.search(q, limit)
+        ]
+    }
 
 @app.get("/ratios/{ticker}")
-def ratios(ticker: str, limit: int = Query(10, ge=1, le=50)):
+def ratios(ticker: str, limit: int | None = Query(None, ge=1), format: str = FORMAT_QUERY):
+    limit = _json_limit(format, limit, default=10, maximum=50)
     ticker = ticker.upper()
+    c = symbols.get(ticker)
+    if not c:
+        raise HTTPException(status_code=404, detail="Ticker not found")
+    cik = c.cik
+
+    snap = snapshots.get()
+    rows = snap.ratios(cik, limit) if snap is not None else None
+
+    # Not in the snapshot (none published, or company added since): ask Postgres
+    if rows is None:
+        sql = f"""
+            SELECT {", ".join(RATIO_COLUMNS)}
+            FROM ratios_annual
+            WHERE cik=%s
+            ORDER BY fiscal_year DESC
+            LIMIT %s
+        """
+        if format != "json":
+            return _stream(format, RATIO_COLUMNS, _db_batches(sql, (cik, limit)))
+
+        with get_conn() as conn:
+            with conn.cursor() as cur:
+                cur.execute(sql, (cik, limit))
+                rows = cur.fetchall()
+
+    if format != "json":
+        return _stream(format, RATIO_COLUMNS, _chunks(rows))
+
+    return {
+        "ticker": ticker,
+        "years": [dict(zip(RATIO_COLUMNS, r)) for r in rows],
+    }
+
+@app.get("/peers/{ticker}")
+def peers(
+    ticker: str,
+    by: str = Query("sector", pattern="^(sector|industry)$"),
+    limit: int = Query(5, ge=1, le=50),
+):
+    c = symbols.get(ticker)
+    if not c:
+        raise HTTPException(status_code=404, detail="Ticker not found")
+    group = c.sector if by == "sector" else c.industry
+    if not group:
+        raise HTTPException(status_code=404, detail=f"No {by} known for ticker (seed with --enrich)")
+
     with get_conn() as conn:
         with conn.cursor() as cur:
-            cur.execute("SELECT cik FROM companies WHERE ticker=%s", (ticker,))
-            r = cur.fetchone()
-            if not r:
-                raise HTTPException(status_code=404, detail="Ticker not found")
-            cik = r[0]
-
-            cur.execute(
-                """
-                SELECT fiscal_year, gross_margin, operating_margin, net_margin,
-                       roa, roe, leverage, fcf_margin, asset_turnover
-                FROM ratios_annual
-                WHERE cik=%s
-                ORDER BY fiscal_year DESC
-                LIMIT %s
-                """,
-                (cik, limit),
-            )
+            cur.execute(PEERS_SQL, (c.cik, by, group, c.cik, limit))
             rows = cur.fetchall()
 
+    years: dict = {}
+    for fy, metric, value, n, mean, p25, median, p75 in rows:
+        years.setdefault(fy, {})[metric] = {
+            "value": value,
+            "peer_count": n,
+            "peer_mean": mean,
+            "peer_p25": p25,
+            "peer_median": median,
+            "peer_p75": p75,
+        }
+
     return {
-        "ticker": ticker,
-        "years": [
-            {
-                "fiscal_year": fy,
-                "gross_margin": gm,
-                "operating_margin": om,
-                "net_margin": nm,
-                "roa": roa,
-                "roe": roe,
-                "leverage": lev,
-                "fcf_margin": fcfm,
-                "asset_turnover": at,
-            }
-            for (fy, gm, om, nm, roa, roe, lev, fcfm, at) in rows
-        ],
+        "ticker": c.ticker,
+        "by": by,
+        "group": group,
+        "years": [{"fiscal_year": fy, "metrics": m} for fy, m in years.items()],
     }
 
 @app.get("/screener")
@@ -66,8 +210,20 @@ def screener(
     min_fcf_margin: float | None = None,
     min_net_margin: float | None = None,
     year: int | None = None,
-    limit: int = Query(25, ge=1, le=200),
+    limit: int | None = Query(None, ge=1),
+    format: str = FORMAT_QUERY,
 ):
+    limit = _json_limit(format, limit, default=25, maximum=200)
+
+    snap = snapshots.get()
+    if snap is not None:
+        idx = snap.screener_indices(year, min_roe, min_fcf_margin, min_net_margin, limit)
+        if format != "json":
+            # Materialize tuples one chunk at a time; the index array is all that is held up front
+            batches = (snap.screener_rows(idx[i : i + STREAM_BATCH_ROWS]) for i in range(0, len(idx), STREAM_BATCH_ROWS))
+            return _stream(format, SCREENER_COLUMNS, batches)
+        return {"results": [dict(zip(SCREENER_COLUMNS, r)) for r in snap.screener_rows(idx)]}
+
     filters = []
     params = []
 
@@ -89,6 +245,7 @@ def screener(
 
     where = ("WHERE " + " AND ".join(filters)) if filters else ""
 
+    # LIMIT NULL (streaming without a limit) means no limit in Postgres
     sql = f"""
         SELECT c.ticker, c.name, r.fiscal_year, r.roe, r.fcf_margin, r.net_margin
         FROM ratios_annual r
@@ -99,21 +256,12 @@ def screener(
     """
     params.append(limit)
 
+    if format != "json":
+        return _stream(format, SCREENER_COLUMNS, _db_batches(sql, tuple(params)))
+
     with get_conn() as conn:
         with conn.cursor() as cur:
             cur.execute(sql, tuple(params))
             rows = cur.fetchall()
 
-    return {
-        "results": [
-            {
-                "ticker": t,
-                "name": n,
-                "fiscal_year": fy,
-                "roe": roe,
-                "fcf_margin": fcfm,
-                "net_margin": nm,
-            }
-            for (t, n, fy, roe, fcfm, nm) in rows
-        ]
-    }
\ No newline at end of file
+    return {"results": [dict(zip(SCREENER_COLUMNS, r)) for r in rows]}
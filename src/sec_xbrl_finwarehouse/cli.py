@@ -0,0 +1,172 @@
+import argparse
+import os
+from datetime import datetime, timezone
+from typing import List, Optional
+
+# Keep this module import-light: each subcommand imports its own dependencies
+# (requests, psycopg2, FastAPI/uvicorn) only when it actually runs.
+
+
+def _iso_datetime(s: str) -> datetime:
+    dt = datetime.fromisoformat(s)
+    return dt if dt.tzinfo is not None else dt.replace(tzinfo=timezone.utc)
+
+
+def _add_seed_args(p: argparse.ArgumentParser) -> None:
+    p.add_argument("--all", action="store_true",
+                   help="seed the full SEC ticker universe instead of TICKERS")
+    p.add_argument("--enrich", action="store_true",
+                   help="fill sic/sector/industry from SEC submissions data")
+    p.add_argument("--refresh-sic", action="store_true",
+                   help="with --enrich, also refresh companies that already have a SIC code")
+    p.add_argument("--submissions-zip", default=None,
+                   help="read submissions from a local copy of the bulk submissions.zip")
+    p.add_argument("--concurrency", type=int, default=2,
+                   help="concurrent submissions fetches when not using --submissions-zip")
+
+
+def _add_ingest_args(p: argparse.ArgumentParser) -> None:
+    p.add_argument("--fetchers", type=int, default=2,
+                   help="concurrent SEC fetch threads (each paces itself to ~5 req/s)")
+    p.add_argument("--parsers", type=int, default=min(4, os.cpu_count() or 1),
+                   help="JSON parsing processes")
+    p.add_argument("--batch-size", type=int, default=25,
+                   help="companies written per transaction")
+    p.add_argument("--batch-rows", type=int, default=200_000,
+                   help="flush a batch early once it holds this many facts")
+    p.add_argument("--queue-size", type=int, default=8,
+                   help="max items buffered between pipeline stages")
+    p.add_argument("--since", type=_iso_datetime, default=None,
+                   help="also re-ingest completed companies last fetched before this ISO date/time")
+    p.add_argument("--only-failed", action="store_true",
+                   help="only retry companies whose last attempt failed (ignores retry backoff)")
+    p.add_argument("--refresh", action="store_true",
+                   help="re-fetch every completed company; unchanged ones are skipped by change detection")
+    p.add_argument("--full", action="store_true",
+                   help="re-fetch every company with change detection disabled (send every fact again)")
+    p.add_argument("--retry-backoff", type=float, default=300.0,
+                   help="seconds before a failed company is retried; doubles per consecutive failure")
+
+
+def _add_incremental_arg(p: argparse.ArgumentParser, help: str) -> None:
+    p.add_argument("--incremental", action="store_true", help=help)
+
+
+def _cmd_seed(args: argparse.Namespace) -> int:
+    from .pipeline import seed
+    return seed.run(args)
+
+
+def _cmd_ingest(args: argparse.Namespace) -> int:
+    from .pipeline import ingest
+    return ingest.run(args)
+
+
+def _cmd_load_fx(args: argparse.Namespace) -> int:
+    from .pipeline import fx_rates
+    return fx_rates.run(args)
+
+
+def _cmd_build(args: argparse.Namespace) -> int:
+    from .pipeline import statements
+    return statements.run(args)
+
+
+def _cmd_ratios(args: argparse.Namespace) -> int:
+    from .pipeline import ratios
+    return ratios.run(args)
+
+
+def _cmd_snapshot(args: argparse.Namespace) -> int:
+    from .pipeline import ratios
+    return ratios.publish_snapshot()
+
+
+def _cmd_rollups(args: argparse.Namespace) -> int:
+    from .pipeline import rollups
+    return rollups.run(args)
+
+
+def _cmd_run_all(args: argparse.Namespace) -> int:
+    steps = [("ingest", _cmd_ingest), ("build", _cmd_build), ("ratios", _cmd_ratios), ("rollups", _cmd_rollups)]
+    if not args.skip_seed:
+        steps.insert(0, ("seed", _cmd_seed))
+
+    # The incremental daily run re-fetches everything and lets change detection skip the unchanged
+    args.refresh = args.refresh or args.incremental
+
+    rc = 0
+    for name, cmd in steps:
+        print(f"\n=== {name} ===")
+        # A partially failed ingest still feeds the builders; the exit code reports it
+        rc = cmd(args) or rc
+    return rc
+
+
+def _cmd_serve(args: argparse.Namespace) -> int:
+    import uvicorn
+
+    uvicorn.run(
+        "sec_xbrl_finwarehouse.api:app",
+        host=args.host,
+        port=args.port,
+        workers=args.workers,
+        reload=args.reload,
+    )
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="sec_xbrl_finwarehouse",
+        description="SEC XBRL company facts -> Postgres -> FastAPI (ratios + screener)",
+    )
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("seed", help="seed companies (ticker -> CIK) from SEC")
+    _add_seed_args(p)
+    p.set_defaults(func=_cmd_seed)
+
+    p = sub.add_parser("ingest", help="ingest SEC company facts into Postgres")
+    _add_ingest_args(p)
+    p.set_defaults(func=_cmd_ingest)
+
+    p = sub.add_parser("load-fx", help="load period-end FX rates (USD per unit) from a local CSV")
+    p.add_argument("path", help="CSV with a header row: currency,rate_date,usd_per_unit")
+    p.set_defaults(func=_cmd_load_fx)
+
+    p = sub.add_parser("build", help="build statements_annual from facts")
+    _add_incremental_arg(p, "only rebuild companies marked dirty by ingest")
+    p.set_defaults(func=_cmd_build)
+
+    p = sub.add_parser("ratios", help="compute ratios_annual from statements_annual")
+    _add_incremental_arg(p, "only recompute companies whose statements were rebuilt")
+    p.set_defaults(func=_cmd_ratios)
+
+    p = sub.add_parser("snapshot", help="publish the memory-mapped ratio snapshot (RATIOS_SNAPSHOT_PATH)")
+    p.set_defaults(func=_cmd_snapshot)
+
+    p = sub.add_parser("rollups", help="build sector/industry peer aggregates")
+    _add_incremental_arg(p, "only recompute peer groups containing companies whose ratios changed")
+    p.set_defaults(func=_cmd_rollups)
+
+    p = sub.add_parser("run-all", help="seed, ingest, build, ratios and rollups in one go")
+    p.add_argument("--skip-seed", action="store_true", help="start from the existing companies table")
+    _add_seed_args(p)
+    _add_ingest_args(p)
+    _add_incremental_arg(p, "builders only revisit companies whose data changed")
+    p.set_defaults(func=_cmd_run_all)
+
+    p = sub.add_parser("serve", help="run the API with uvicorn")
+    p.add_argument("--host", default="127.0.0.1")
+    p.add_argument("--port", type=int, default=8000)
+    p.add_argument("--workers", type=int, default=1)
+    p.add_argument("--reload", action="store_true")
+    p.set_defaults(func=_cmd_serve)
+
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    return args.func(args)
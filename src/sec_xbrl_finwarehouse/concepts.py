@@ -0,0 +1,102 @@
+from typing import Dict, FrozenSet, NamedTuple, Optional, Tuple
+
+from .sic import BANK, DEFAULT, INSURANCE
+
+# Declarative us-gaap concept -> statements_annual mapping.
+# Each field lists its tags in fallback order (first one reported wins). Industry groups (sic.py)
+# override individual fields; everything else inherits DEFAULT. Compiled once at import
+# into the ingest whitelist, the builder's SQL tag sets and a (group, tag) lookup.
+
+FLOW = "flow"    # duration facts (~1 year)
+STOCK = "stock"  # point-in-time facts at period end
+
+class Concept(NamedTuple):
+    field: str              # statements_annual column
+    kind: str               # FLOW or STOCK
+    tags: Tuple[str, ...]   # fallback order
+
+CONCEPTS = (
+    Concept("revenues", FLOW, (
+        "RevenueFromContractWithCustomerExcludingAssessedTax",
+        "SalesRevenueNet",
+        "Revenues",
+        "TotalRevenues",
+    )),
+    Concept("gross_profit", FLOW, ("GrossProfit",)),
+    Concept("operating_income", FLOW, ("OperatingIncomeLoss",)),
+    Concept("net_income", FLOW, ("NetIncomeLoss",)),
+    Concept("total_assets", STOCK, ("Assets",)),
+    Concept("total_liabilities", STOCK, ("Liabilities",)),
+    Concept("total_equity", STOCK, ("StockholdersEquity",)),
+    Concept("operating_cash_flow", FLOW, ("NetCashProvidedByUsedInOperatingActivities",)),
+    Concept("capex", FLOW, ("PaymentsToAcquirePropertyPlantAndEquipment",)),
+)
+
+_PRETAX_INCOME = "IncomeLossFromContinuingOperationsBeforeIncomeTaxesExtraordinaryItemsNoncontrollingInterest"
+
+OVERRIDES: Dict[str, Tuple[Concept, ...]] = {
+    # Banks report net revenue (after interest expense) and have no gross profit / operating income line
+    BANK: (
+        Concept("revenues", FLOW, ("RevenuesNetOfInterestExpense", "Revenues")),
+        Concept("operating_income", FLOW, ("OperatingIncomeLoss", _PRETAX_INCOME)),
+    ),
+    INSURANCE: (
+        Concept("revenues", FLOW, ("Revenues", "PremiumsEarnedNet")),
+        Concept("operating_income", FLOW, ("OperatingIncomeLoss", _PRETAX_INCOME)),
+    ),
+}
+
+class CompiledConcepts(NamedTuple):
+    fields: Tuple[str, ...]                       # statements_annual columns, in CONCEPTS order
+    ingest_tags: FrozenSet[str]                   # every tag any group can use
+    flow_tags: Tuple[str, ...]
+    stock_tags: Tuple[str, ...]
+    lookup: Dict[Tuple[str, str], Tuple[int, int]]  # (group, tag) -> (field index, priority)
+
+def compile_concepts(
+    concepts: Tuple[Concept, ...] = CONCEPTS,
+    overrides: Optional[Dict[str, Tuple[Concept, ...]]] = None,
+) -> CompiledConcepts:
+    overrides = OVERRIDES if overrides is None else overrides
+    fields = tuple(c.field for c in concepts)
+    index = {f: i for i, f in enumerate(fields)}
+
+    kinds: Dict[str, str] = {}
+    lookup: Dict[Tuple[str, str], Tuple[int, int]] = {}
+    groups = {DEFAULT: {c.field: c for c in concepts}}
+    for group, group_concepts in overrides.items():
+        groups[group] = dict(groups[DEFAULT])
+        for c in group_concepts:
+            if c.field not in index:
+                raise ValueError(f"Override for unknown field {c.field!r} ({group})")
+            groups[group][c.field] = c
+
+    for group, by_field in groups.items():
+        for c in by_field.values():
+            for priority, tag in enumerate(c.tags):
+                # The SQL filters select facts by tag, so one tag can't be both a flow and a stock
+                if kinds.setdefault(tag, c.kind) != c.kind:
+                    raise ValueError(f"Tag {tag!r} mapped as both {kinds[tag]} and {c.kind}")
+                if (group, tag) in lookup:
+                    raise ValueError(f"Tag {tag!r} mapped to more than one field ({group})")
+                lookup[(group, tag)] = (index[c.field], priority)
+
+    return CompiledConcepts(
+        fields=fields,
+        ingest_tags=frozenset(kinds),
+        flow_tags=tuple(sorted(t for t, k in kinds.items() if k == FLOW)),
+        stock_tags=tuple(sorted(t for t, k in kinds.items() if k == STOCK)),
+        lookup=lookup,
+    )
+
+COMPILED = compile_concepts()
+
+def field_tags(field: str, group: str = DEFAULT) -> Tuple[str, ...]:
+    """Tags for `field` in fallback order."""
+    for c in OVERRIDES.get(group, ()):
+        if c.field == field:
+            return c.tags
+    for c in CONCEPTS:
+        if c.field == field:
+            return c.tags
+    raise KeyError(field)
@@ -0,0 +1,35 @@
+import os
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Optional, Tuple
+
+
+@dataclass(frozen=True)
+class Settings:
+    database_url: Optional[str]
+    sec_user_agent: Optional[str]
+    tickers: Tuple[str, ...]
+    slow_query_ms: float
+    explain_slow_queries: bool
+    query_debug: bool
+    symbol_index_ttl: float
+    ratios_snapshot_path: Optional[str]
+
+
+@lru_cache(maxsize=None)
+def get_settings() -> Settings:
+    # .env is read once per process, on first use (not at import)
+    from dotenv import load_dotenv
+
+    load_dotenv()
+    tickers = os.getenv("TICKERS", "")
+    return Settings(
+        database_url=os.getenv("DATABASE_URL"),
+        sec_user_agent=os.getenv("SEC_USER_AGENT"),
+        tickers=tuple(t.strip().upper() for t in tickers.split(",") if t.strip()),
+        slow_query_ms=float(os.getenv("SLOW_QUERY_MS", "250")),
+        explain_slow_queries=os.getenv("EXPLAIN_SLOW_QUERIES", "0") == "1",
+        query_debug=os.getenv("QUERY_DEBUG", "0") == "1",
+        symbol_index_ttl=float(os.getenv("SYMBOL_INDEX_TTL", "300")),
+        ratios_snapshot_path=os.getenv("RATIOS_SNAPSHOT_PATH") or None,
+    )
@@ -1,11 +1,254 @@
-import os
-from dotenv import load_dotenv
+import logging
+import re
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional
+
 import psycopg2
+import psycopg2.extensions
+
+from .config import get_settings
+
+logger = logging.getLogger(__name__)
+
+_STRING_RE = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_RE = re.compile(r"(?<![\w.])\d+(?:\.\d*)?(?:[eE][-+]?\d+)?|(?<![\w.])\.\d+(?:[eE][-+]?\d+)?")
+# A sign right after an opening paren, comma or comparison belongs to the literal, not an operator
+_SIGNED_RE = re.compile(r"([(,=<>]\s*)[-+]\s*\?")
+_PLACEHOLDER_RE = re.compile(r"%\(\w+\)s|%s")
+_IN_LIST_RE = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+# execute_values pages and adapted Python lists: any number of rows/elements is one shape
+_VALUES_RE = re.compile(r"\bVALUES\s*\([^()]*\)(?:\s*,\s*\([^()]*\))*", re.IGNORECASE)
+_ARRAY_RE = re.compile(r"\bARRAY\s*\[[^\[\]]*\]", re.IGNORECASE)
+_WS_RE = re.compile(r"\s+")
+
+# Longest fingerprint written to the slow-query log
+LOG_FINGERPRINT_CHARS = 2000
+
+
+def fingerprint(sql: Any) -> str:
+    """Normalize a statement so that calls differing only by literals group together."""
+    if isinstance(sql, bytes):
+        sql = sql.decode("utf-8", "replace")
+    elif not isinstance(sql, str):
+        sql = str(sql)
+    fp = _STRING_RE.sub("?", sql)
+    fp = _PLACEHOLDER_RE.sub("?", fp)
+    fp = _NUMBER_RE.sub("?", fp)
+    fp = _SIGNED_RE.sub(r"\1?", fp)
+    fp = _ARRAY_RE.sub("ARRAY[...]", fp)
+    fp = _VALUES_RE.sub("VALUES (...)", fp)
+    fp = _IN_LIST_RE.sub("(...)", fp)
+    return _WS_RE.sub(" ", fp).strip().rstrip(";")
+
+
+@dataclass
+class QueryStat:
+    fingerprint: str
+    duration_ms: float
+    rows: int
+    many: bool = False
+
+
+@dataclass
+class QueryProfile:
+    queries: List[QueryStat] = field(default_factory=list)
+
+    @property
+    def count(self) -> int:
+        return len(self.queries)
+
+    @property
+    def total_ms(self) -> float:
+        return sum(q.duration_ms for q in self.queries)
+
+    def summary(self) -> List[Dict[str, Any]]:
+        """Per-fingerprint breakdown, slowest first."""
+        grouped: Dict[str, Dict[str, Any]] = defaultdict(
+            lambda: {"calls": 0, "total_ms": 0.0, "max_ms": 0.0, "rows": 0}
+        )
+        for q in self.queries:
+            g = grouped[q.fingerprint]
+            g["calls"] += 1
+            g["total_ms"] += q.duration_ms
+            g["max_ms"] = max(g["max_ms"], q.duration_ms)
+            g["rows"] += max(q.rows, 0)
+
+        out = [
+            {
+                "fingerprint": fp,
+                "calls": g["calls"],
+                "total_ms": round(g["total_ms"], 3),
+                "max_ms": round(g["max_ms"], 3),
+                "rows": g["rows"],
+            }
+            for fp, g in grouped.items()
+        ]
+        out.sort(key=lambda g: g["total_ms"], reverse=True)
+        return out
+
+
+_current_profile: ContextVar[Optional[QueryProfile]] = ContextVar("query_profile", default=None)
+
+
+@contextmanager
+def profile_queries() -> Iterator[QueryProfile]:
+    """Collect every statement executed through ProfilingCursor in the current context."""
+    profile = QueryProfile()
+    token = _current_profile.set(profile)
+    try:
+        yield profile
+    finally:
+        _current_profile.reset(token)
+
+
+def _is_explainable(sql: Any) -> bool:
+    if not isinstance(sql, (str, bytes)):
+        return False
+    if isinstance(sql, bytes):
+        sql = sql.decode("utf-8", "replace")
+    head = str(sql).lstrip().split(None, 1)
+    return bool(head) and head[0].upper() in ("SELECT", "WITH")
+
+
+class ProfilingCursor(psycopg2.extensions.cursor):
+    """Cursor recording duration, row count and fingerprint of every statement."""
+
+    def execute(self, query, vars=None):
+        start = time.perf_counter()
+        result = super().execute(query, vars)
+        self._record(query, vars, start, many=False)
+        return result
+
+    def executemany(self, query, vars_list):
+        start = time.perf_counter()
+        result = super().executemany(query, vars_list)
+        self._record(query, None, start, many=True)
+        return result
+
+    def _record(self, query, vars, start: float, many: bool) -> None:
+        duration_ms = (time.perf_counter() - start) * 1000.0
+        if self.name is not None:
+            # Server-side cursor: execute only DECLAREs. Fetches add their time and rows,
+            # and the statement is judged on the total when the cursor closes
+            self._finish_stream()
+            profile = _current_profile.get()
+            stat = QueryStat(fingerprint(query), duration_ms, 0, many) if profile is not None else None
+            if stat is not None:
+                profile.queries.append(stat)
+            self._stream = [query, duration_ms, 0, stat]
+            return
+
+        profile = _current_profile.get()
+        settings = get_settings()
+        if profile is None and duration_ms < settings.slow_query_ms:
+            # Nobody is looking: fingerprinting a 1 MB execute_values page isn't free
+            return
+
+        stat = QueryStat(fingerprint(query), duration_ms, self.rowcount, many)
+        if profile is not None:
+            profile.queries.append(stat)
+
+        # Queries slower than SLOW_QUERY_MS are logged (and optionally EXPLAINed)
+        if duration_ms >= settings.slow_query_ms:
+            self._log_slow(stat)
+            # EXPLAIN ANALYZE re-runs the statement, so it is opt-in and SELECT-only
+            if settings.explain_slow_queries and not many and _is_explainable(query):
+                self._explain(query, vars)
+
+    def fetchone(self):
+        start = time.perf_counter()
+        row = super().fetchone()
+        self._fetched(start, 0 if row is None else 1)
+        return row
+
+    def fetchmany(self, size=None):
+        start = time.perf_counter()
+        rows = super().fetchmany(self.arraysize if size is None else size)
+        self._fetched(start, len(rows))
+        return rows
+
+    def fetchall(self):
+        start = time.perf_counter()
+        rows = super().fetchall()
+        self._fetched(start, len(rows))
+        return rows
+
+    def __iter__(self):
+        if self.name is None:
+            return super().__iter__()
+        # The C iterator bypasses fetchmany; go through it so fetches are timed
+        return self._iter_named()
+
+    def _iter_named(self):
+        while True:
+            rows = self.fetchmany(self.itersize)
+            if not rows:
+                return
+            yield from rows
+
+    def close(self):
+        self._finish_stream()
+        super().close()
+
+    def _fetched(self, start: float, rows: int) -> None:
+        stream = getattr(self, "_stream", None)
+        if stream is None:
+            return
+        duration_ms = (time.perf_counter() - start) * 1000.0
+        stream[1] += duration_ms
+        stream[2] += rows
+        stat = stream[3]
+        if stat is not None:
+            stat.duration_ms += duration_ms
+            stat.rows += rows
+
+    def _finish_stream(self) -> None:
+        stream = getattr(self, "_stream", None)
+        if stream is None:
+            return
+        self._stream = None
+        query, duration_ms, rows, stat = stream
+        if duration_ms >= get_settings().slow_query_ms:
+            self._log_slow(stat or QueryStat(fingerprint(query), duration_ms, rows))
+
+    @staticmethod
+    def _log_slow(stat: QueryStat) -> None:
+        fp = stat.fingerprint
+        if len(fp) > LOG_FINGERPRINT_CHARS:
+            fp = f"{fp[:LOG_FINGERPRINT_CHARS]}... ({len(stat.fingerprint)} chars)"
+        logger.warning("slow query (%.1f ms, %d rows): %s", stat.duration_ms, stat.rows, fp)
+
+    def _explain(self, query, vars) -> None:
+        # Savepoint so a failing EXPLAIN doesn't abort the caller's transaction
+        in_tx = not self.connection.autocommit
+        with self.connection.cursor(cursor_factory=psycopg2.extensions.cursor) as cur:
+            try:
+                if in_tx:
+                    cur.execute("SAVEPOINT explain_slow_query")
+                cur.execute(b"EXPLAIN (ANALYZE, BUFFERS) " + self._as_bytes(query), vars)
+                plan = "\n".join(r[0] for r in cur.fetchall())
+                if in_tx:
+                    cur.execute("RELEASE SAVEPOINT explain_slow_query")
+            except psycopg2.Error as e:
+                if in_tx:
+                    cur.execute("ROLLBACK TO SAVEPOINT explain_slow_query")
+                logger.warning("could not EXPLAIN slow query: %s", e)
+                return
+        logger.warning("plan for slow query:\n%s", plan)
+
+    @staticmethod
+    def _as_bytes(query) -> bytes:
+        if isinstance(query, bytes):
+            return query
+        return str(query).encode("utf-8")
 
-load_dotenv()
 
 def get_conn():
-    db_url = os.getenv("DATABASE_URL")
+    db_url = get_settings().database_url
     if not db_url:
         raise ValueError("Missing DATABASE_URL in .env")
-    return psycopg2.connect(db_url)
\ No newline at end of file
+    return psycopg2.connect(db_url, cursor_factory=ProfilingCursor)
@@ -0,0 +1,45 @@
+from typing import Iterable, List, Tuple
+
+from psycopg2.extras import execute_values
+
+# Stages consume their own marks and mark the next one: ingest -> statements -> ratios -> rollups
+STATEMENTS = "statements"
+RATIOS = "ratios"
+ROLLUPS = "rollups"
+
+def mark_dirty(cur, ciks: Iterable[str], stage: str) -> None:
+    rows = [(cik, stage) for cik in set(ciks)]
+    if not rows:
+        return
+    execute_values(
+        cur,
+        """
+        INSERT INTO dirty_companies (cik, stage)
+        VALUES %s
+        ON CONFLICT (cik, stage) DO UPDATE SET marked_at = now()
+        """,
+        rows,
+    )
+
+def claim_dirty(cur, stage: str) -> List[str]:
+    # Call inside the transaction that rebuilds them: a rollback restores the marks
+    cur.execute("DELETE FROM dirty_companies WHERE stage=%s RETURNING cik", (stage,))
+    return sorted(r[0] for r in cur.fetchall())
+
+def mark_groups_dirty(cur, groups: Iterable[Tuple[str, str]]) -> None:
+    rows = sorted(set(groups))
+    if not rows:
+        return
+    execute_values(
+        cur,
+        """
+        INSERT INTO dirty_peer_groups (group_kind, group_name)
+        VALUES %s
+        ON CONFLICT (group_kind, group_name) DO UPDATE SET marked_at = now()
+        """,
+        rows,
+    )
+
+def claim_dirty_groups(cur) -> List[Tuple[str, str]]:
+    cur.execute("DELETE FROM dirty_peer_groups RETURNING group_kind, group_name")
+    return sorted(cur.fetchall())
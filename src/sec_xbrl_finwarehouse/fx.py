@@ -0,0 +1,52 @@
+import bisect
+from datetime import date, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+USD = "USD"
+
+class FxTable:
+    """Period-end FX rates (USD per unit), looked up by (currency, date) with a per-pair cache."""
+
+    def __init__(self, rates: Dict[str, Tuple[List[date], list]], max_age_days: int = 7):
+        self._rates = rates
+        # Period ends often fall on weekends/holidays: accept the latest rate up to this many days before
+        self._max_age = timedelta(days=max_age_days)
+        self._cache: Dict[Tuple[str, date], Optional[object]] = {}
+
+    @classmethod
+    def load(cls, cur, currencies: Iterable[str], max_age_days: int = 7) -> "FxTable":
+        currencies = sorted(set(currencies) - {USD})
+        rates: Dict[str, Tuple[List[date], list]] = {}
+        if currencies:
+            cur.execute(
+                """
+                SELECT currency, rate_date, usd_per_unit
+                FROM fx_rates
+                WHERE currency = ANY(%s)
+                ORDER BY currency, rate_date
+                """,
+                (currencies,),
+            )
+            for currency, rate_date, usd_per_unit in cur.fetchall():
+                dates, values = rates.setdefault(currency, ([], []))
+                dates.append(rate_date)
+                values.append(usd_per_unit)
+        return cls(rates, max_age_days)
+
+    def rate(self, currency: str, on: date):
+        """USD per unit of `currency` at `on`, or None when no recent enough rate is loaded."""
+        if currency == USD:
+            return 1
+        key = (currency, on)
+        if key in self._cache:
+            return self._cache[key]
+
+        rate = None
+        series = self._rates.get(currency)
+        if series is not None:
+            dates, values = series
+            i = bisect.bisect_right(dates, on) - 1
+            if i >= 0 and on - dates[i] <= self._max_age:
+                rate = values[i]
+        self._cache[key] = rate
+        return rate
@@ -0,0 +1,107 @@
+from typing import List, Optional, Sequence, Tuple
+
+# ratios_annual columns aggregated per peer group
+RATIO_METRICS = (
+    "gross_margin",
+    "operating_margin",
+    "net_margin",
+    "roa",
+    "roe",
+    "leverage",
+    "fcf_margin",
+    "asset_turnover",
+)
+
+# One row per (company, group kind, fiscal year, metric) with a non-null value
+_MEMBER_VALUES = f"""
+    SELECT g.kind AS group_kind, g.name AS group_name, r.fiscal_year, v.metric, v.value, r.cik
+    FROM ratios_annual r
+    JOIN companies c ON c.cik = r.cik
+    CROSS JOIN LATERAL (VALUES ('sector', c.sector), ('industry', c.industry)) g(kind, name)
+    CROSS JOIN LATERAL (VALUES {", ".join(f"('{m}', r.{m})" for m in RATIO_METRICS)}) v(metric, value)
+    WHERE g.name IS NOT NULL
+      AND v.value IS NOT NULL
+"""
+
+def rebuild_peer_stats(
+    cur, ciks: Optional[List[str]] = None, groups: Sequence[Tuple[str, str]] = ()
+) -> int:
+    """Recompute peer_ratio_stats, either fully or only for the groups/years containing `ciks`
+    plus every year of `groups` ((group_kind, group_name) pairs, e.g. groups a company left)."""
+    if ciks is None:
+        cur.execute("DELETE FROM peer_ratio_stats")
+        scope = ""
+    else:
+        cur.execute(
+            """
+            CREATE TEMP TABLE rollup_scope ON COMMIT DROP AS
+            SELECT DISTINCT g.kind AS group_kind, g.name AS group_name, r.fiscal_year
+            FROM ratios_annual r
+            JOIN companies c ON c.cik = r.cik
+            CROSS JOIN LATERAL (VALUES ('sector', c.sector), ('industry', c.industry)) g(kind, name)
+            WHERE r.cik = ANY(%s) AND g.name IS NOT NULL
+            """,
+            (ciks,),
+        )
+        if groups:
+            cur.execute(
+                """
+                INSERT INTO rollup_scope (group_kind, group_name, fiscal_year)
+                SELECT DISTINCT p.group_kind, p.group_name, p.fiscal_year
+                FROM peer_ratio_stats p
+                JOIN unnest(%s::text[], %s::text[]) g(kind, name)
+                  ON g.kind = p.group_kind AND g.name = p.group_name
+                """,
+                ([k for k, _ in groups], [n for _, n in groups]),
+            )
+        cur.execute(
+            """
+            DELETE FROM peer_ratio_stats p
+            USING rollup_scope s
+            WHERE p.group_kind = s.group_kind
+              AND p.group_name = s.group_name
+              AND p.fiscal_year = s.fiscal_year
+            """
+        )
+        scope = """
+            WHERE EXISTS (
+              SELECT 1 FROM rollup_scope s
+              WHERE s.group_kind = m.group_kind
+                AND s.group_name = m.group_name
+                AND s.fiscal_year = m.fiscal_year
+            )
+        """
+
+    cur.execute(
+        f"""
+        INSERT INTO peer_ratio_stats (
+          group_kind, group_name, fiscal_year, metric, n, mean, p25, median, p75
+        )
+        SELECT
+          group_kind, group_name, fiscal_year, metric,
+          count(*),
+          avg(value),
+          percentile_cont(0.25) WITHIN GROUP (ORDER BY value),
+          percentile_cont(0.5) WITHIN GROUP (ORDER BY value),
+          percentile_cont(0.75) WITHIN GROUP (ORDER BY value)
+        FROM ({_MEMBER_VALUES}) m
+        {scope}
+        GROUP BY group_kind, group_name, fiscal_year, metric
+        """
+    )
+    return cur.rowcount
+
+# Company value next to its peer stats; params: (cik, group_kind, group_name, cik, n_years)
+PEERS_SQL = f"""
+    SELECT s.fiscal_year, s.metric,
+           CASE s.metric {" ".join(f"WHEN '{m}' THEN r.{m}" for m in RATIO_METRICS)} END AS value,
+           s.n, s.mean, s.p25, s.median, s.p75
+    FROM peer_ratio_stats s
+    LEFT JOIN ratios_annual r ON r.cik = %s AND r.fiscal_year = s.fiscal_year
+    WHERE s.group_kind = %s
+      AND s.group_name = %s
+      AND s.fiscal_year IN (
+        SELECT fiscal_year FROM ratios_annual WHERE cik = %s ORDER BY fiscal_year DESC LIMIT %s
+      )
+    ORDER BY s.fiscal_year DESC, s.metric
+"""
@@ -0,0 +1,47 @@
+import argparse
+
+from .. import dirty
+from ..db import get_conn
+
+def run(args: argparse.Namespace) -> int:
+    # CSV columns: currency,rate_date,usd_per_unit (header row required)
+    conn = get_conn()
+    try:
+        with conn:
+            with conn.cursor() as cur:
+                cur.execute(
+                    """
+                    CREATE TEMP TABLE fx_stage (
+                      currency TEXT, rate_date DATE, usd_per_unit NUMERIC
+                    ) ON COMMIT DROP
+                    """
+                )
+                with open(args.path, newline="") as f:
+                    cur.copy_expert("COPY fx_stage FROM STDIN WITH (FORMAT csv, HEADER true)", f)
+
+                cur.execute(
+                    """
+                    INSERT INTO fx_rates (currency, rate_date, usd_per_unit)
+                    SELECT DISTINCT ON (upper(currency), rate_date) upper(currency), rate_date, usd_per_unit
+                    FROM fx_stage
+                    ORDER BY upper(currency), rate_date
+                    ON CONFLICT (currency, rate_date) DO UPDATE
+                      SET usd_per_unit = EXCLUDED.usd_per_unit
+                    """
+                )
+                n = cur.rowcount
+
+                # Statements of companies reporting in these currencies can now be (re)converted
+                cur.execute(
+                    """
+                    SELECT DISTINCT cik FROM facts
+                    WHERE unit IN (SELECT DISTINCT upper(currency) FROM fx_stage)
+                    """
+                )
+                ciks = [r[0] for r in cur.fetchall()]
+                dirty.mark_dirty(cur, ciks, dirty.STATEMENTS)
+    finally:
+        conn.close()
+
+    print(f"✅ Upserted fx_rates rows: {n} ({len(ciks)} companies marked for rebuild)")
+    return 0
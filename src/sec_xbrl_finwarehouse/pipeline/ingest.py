@@ -0,0 +1,351 @@
+import argparse
+import multiprocessing
+import queue
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, List, Optional, Tuple
+
+from psycopg2.extras import execute_values
+
+from .. import dirty
+from ..db import get_conn
+from ..sec_client import SecClient
+from ..transform import EXTRACT_KEY, ParsedCompany, PrevState, parse_company_facts
+
+# Pipeline: fetchers (threads, network-bound) -> parsers (processes, CPU-bound) -> one writer (DB).
+# Bounded queues between stages provide backpressure, so memory stays flat however many companies.
+
+_DONE = object()
+
+MAX_RETRY_BACKOFF = timedelta(days=1)
+
+def _pool_context():
+    # Parsers start while fetch threads and a libpq connection are live: forking that can deadlock
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+
+@dataclass
+class CompanyResult:
+    cik: str
+    ticker: str
+    fetched_at: datetime
+    parsed: ParsedCompany
+
+def _put(q: queue.Queue, item: Any, stop: threading.Event) -> bool:
+    # Blocking put that gives up once the pipeline is shutting down
+    while not stop.is_set():
+        try:
+            q.put(item, timeout=0.5)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+def fetch_stage(companies_q: queue.Queue, fetched_q: queue.Queue, stop: threading.Event) -> None:
+    try:
+        client = SecClient()  # one session per thread
+        while not stop.is_set():
+            item = companies_q.get()
+            if item is _DONE:
+                break
+            cik, ticker, prev = item
+            print(f"→ Fetching {ticker} (CIK {cik})")
+            fetched_at = datetime.now(timezone.utc)
+            try:
+                raw = client.get_company_facts_raw(cik)
+            except Exception as e:
+                if not _put(fetched_q, (cik, ticker, fetched_at, prev, None, e), stop):
+                    return
+                continue
+            if not _put(fetched_q, (cik, ticker, fetched_at, prev, raw, None), stop):
+                return
+    finally:
+        _put(fetched_q, _DONE, stop)
+
+def parse_stage(
+    pool: ProcessPoolExecutor,
+    fetched_q: queue.Queue,
+    parsed_q: queue.Queue,
+    n_fetchers: int,
+    stop: threading.Event,
+) -> None:
+    remaining = n_fetchers
+    try:
+        while remaining and not stop.is_set():
+            item = fetched_q.get()
+            if item is _DONE:
+                remaining -= 1
+                continue
+
+            cik, ticker, fetched_at, prev, raw, err = item
+            if err is not None:
+                fut: Future = Future()
+                fut.set_exception(err)
+            else:
+                fut = pool.submit(parse_company_facts, raw, cik, prev)
+
+            # parsed_q holds futures: its bound also caps the number of in-flight parses
+            if not _put(parsed_q, (cik, ticker, fetched_at, fut), stop):
+                return
+    finally:
+        _put(parsed_q, _DONE, stop)
+
+def _run_stage(target, errors: List[Exception], *args) -> None:
+    # A stage that dies still posts _DONE (see the finally blocks); the writer re-raises its error
+    try:
+        target(*args)
+    except Exception as e:
+        errors.append(e)
+
+def select_companies(
+    conn, since: Optional[datetime], only_failed: bool, full: bool, refresh: bool = False
+) -> List[Tuple[str, str, Optional[PrevState]]]:
+    params: tuple = ()
+    if only_failed:
+        # Explicit targeted rerun: ignore the retry backoff
+        where = "k.status = 'failed'"
+    elif full:
+        where = "true"
+    else:
+        # New companies, failures past their backoff, and anything extracted with an older EXTRACT_KEY
+        where = """
+            k.cik IS NULL
+            OR (k.status = 'failed' AND (k.next_retry_at IS NULL OR k.next_retry_at <= now()))
+            OR (k.status = 'done' AND k.extract_key IS DISTINCT FROM %s)
+        """
+        params = (EXTRACT_KEY,)
+        if refresh:
+            # Change detection keeps this cheap: unchanged payloads are hashed, not re-parsed or re-written
+            where += " OR k.status = 'done'"
+        elif since is not None:
+            where += " OR (k.status = 'done' AND (k.last_fetched_at IS NULL OR k.last_fetched_at < %s))"
+            params += (since,)
+
+    with conn.cursor() as cur:
+        cur.execute(
+            f"""
+            SELECT c.cik, c.ticker, k.payload_hash, k.facts_hash, k.max_filed, k.extract_key
+            FROM companies c
+            LEFT JOIN ingest_checkpoints k ON k.cik = c.cik
+            WHERE {where}
+            ORDER BY c.ticker
+            """,
+            params,
+        )
+        rows = cur.fetchall()
+
+    # Without a previous state the parser sends every fact (used by --full)
+    return [
+        (cik, ticker, None if full or key is None else PrevState(payload_hash, facts_hash, max_filed, key))
+        for cik, ticker, payload_hash, facts_hash, max_filed, key in rows
+    ]
+
+def record_failure(conn, cik: str, fetched_at: datetime, err: Exception, retry_backoff: float) -> None:
+    with conn.cursor() as cur:
+        cur.execute("SELECT attempts FROM ingest_checkpoints WHERE cik=%s", (cik,))
+        row = cur.fetchone()
+        attempts = (row[0] if row else 0) + 1
+        delay = min(timedelta(seconds=retry_backoff * 2 ** (attempts - 1)), MAX_RETRY_BACKOFF)
+
+        cur.execute(
+            """
+            INSERT INTO ingest_checkpoints (cik, status, last_fetched_at, error, attempts, next_retry_at)
+            VALUES (%s, 'failed', %s, %s, %s, %s)
+            ON CONFLICT (cik) DO UPDATE SET
+              status = 'failed',
+              last_fetched_at = EXCLUDED.last_fetched_at,
+              error = EXCLUDED.error,
+              attempts = EXCLUDED.attempts,
+              next_retry_at = EXCLUDED.next_retry_at,
+              updated_at = now()
+            """,
+            (cik, fetched_at, f"{type(err).__name__}: {err}", attempts, fetched_at + delay),
+        )
+    conn.commit()
+
+def write_batch(conn, batch: List[CompanyResult]) -> Tuple[int, int]:
+    filing_rows = [r for c in batch for r in c.parsed.filing_rows]
+    fact_rows = [r for c in batch for r in c.parsed.fact_rows]
+    changed = [c.cik for c in batch if c.parsed.changed]
+
+    with conn.cursor() as cur:
+        # Insert filings first (to satisfy FK constraint)
+        if filing_rows:
+            execute_values(
+                cur,
+                """
+                INSERT INTO filings (
+                  accession_no, cik, form, filing_date, report_date, fiscal_year, fiscal_period
+                )
+                VALUES %s
+                ON CONFLICT (accession_no) DO NOTHING
+                """,
+                filing_rows,
+                page_size=1000,
+            )
+
+        # Then insert facts
+        if fact_rows:
+            execute_values(
+                cur,
+                """
+                INSERT INTO facts (
+                  cik, taxonomy, tag, unit, period_start, period_end, value,
+                  filing_accession_no, form, filed, frame
+                )
+                VALUES %s
+                ON CONFLICT DO NOTHING
+                """,
+                fact_rows,
+                page_size=5000,
+            )
+
+        # Checkpoints commit with the data, so a crash never marks unwritten companies done
+        execute_values(
+            cur,
+            """
+            INSERT INTO ingest_checkpoints (
+              cik, status, last_fetched_at, payload_hash, facts_hash, max_filed, extract_key,
+              filings_count, facts_count, error, attempts, next_retry_at
+            )
+            VALUES %s
+            ON CONFLICT (cik) DO UPDATE SET
+              status = EXCLUDED.status,
+              last_fetched_at = EXCLUDED.last_fetched_at,
+              payload_hash = EXCLUDED.payload_hash,
+              facts_hash = EXCLUDED.facts_hash,
+              max_filed = EXCLUDED.max_filed,
+              extract_key = EXCLUDED.extract_key,
+              -- Counts describe the company's full extraction: unchanged companies keep theirs
+              filings_count = COALESCE(EXCLUDED.filings_count, ingest_checkpoints.filings_count),
+              facts_count = COALESCE(EXCLUDED.facts_count, ingest_checkpoints.facts_count),
+              error = NULL,
+              attempts = 0,
+              next_retry_at = NULL,
+              updated_at = now()
+            """,
+            [
+                (
+                    c.cik, "done", c.fetched_at,
+                    c.parsed.payload_hash, c.parsed.facts_hash, c.parsed.max_filed, EXTRACT_KEY,
+                    c.parsed.n_filings, c.parsed.n_facts, None, 0, None,
+                )
+                for c in batch
+            ],
+        )
+
+        # Downstream builders only need to revisit companies whose facts changed
+        dirty.mark_dirty(cur, changed, dirty.STATEMENTS)
+
+    conn.commit()
+
+    for c in batch:
+        if not c.parsed.changed:
+            print(f"  💤 {c.ticker}: unchanged")
+        else:
+            print(
+                f"  ✅ {c.ticker}: filings upsert attempted: {len(c.parsed.filing_rows)}"
+                f" | facts insert attempted: {len(c.parsed.fact_rows)}"
+            )
+
+    return len(filing_rows), len(fact_rows)
+
+def run(args: argparse.Namespace) -> int:
+    SecClient()  # fail fast on a missing SEC_USER_AGENT, before any thread starts
+
+    with get_conn() as conn:
+        companies = select_companies(conn, args.since, args.only_failed, args.full, args.refresh)
+        print(f"→ {len(companies)} companies to ingest")
+
+        companies_q: queue.Queue = queue.Queue()
+        for c in companies:
+            companies_q.put(c)
+        for _ in range(args.fetchers):
+            companies_q.put(_DONE)
+
+        fetched_q: queue.Queue = queue.Queue(maxsize=args.queue_size)
+        parsed_q: queue.Queue = queue.Queue(maxsize=args.queue_size)
+        stop = threading.Event()
+
+        total_facts_attempted = 0
+        total_filings_attempted = 0
+        failed: List[str] = []
+
+        stage_errors: List[Exception] = []
+
+        with ProcessPoolExecutor(max_workers=args.parsers, mp_context=_pool_context()) as pool:
+            threads = [
+                threading.Thread(
+                    target=_run_stage,
+                    args=(fetch_stage, stage_errors, companies_q, fetched_q, stop),
+                    daemon=True,
+                )
+                for _ in range(args.fetchers)
+            ]
+            threads.append(
+                threading.Thread(
+                    target=_run_stage,
+                    args=(parse_stage, stage_errors, pool, fetched_q, parsed_q, args.fetchers, stop),
+                    daemon=True,
+                )
+            )
+            for t in threads:
+                t.start()
+
+            batch: List[CompanyResult] = []
+            batch_rows = 0
+
+            def flush():
+                nonlocal batch, batch_rows, total_filings_attempted, total_facts_attempted
+                if batch:
+                    n_filings, n_facts = write_batch(conn, batch)
+                    total_filings_attempted += n_filings
+                    total_facts_attempted += n_facts
+                batch, batch_rows = [], 0
+
+            try:
+                while True:
+                    try:
+                        item = parsed_q.get(timeout=1.0)
+                    except queue.Empty:
+                        if stage_errors:
+                            raise stage_errors[0]
+                        if not any(t.is_alive() for t in threads):
+                            raise RuntimeError("ingest pipeline stages exited without finishing")
+                        continue
+                    if item is _DONE:
+                        break
+
+                    cik, ticker, fetched_at, fut = item
+                    try:
+                        parsed = fut.result()
+                    except Exception as e:
+                        print(f"  ❌ {ticker}: {e}")
+                        record_failure(conn, cik, fetched_at, e, args.retry_backoff)
+                        failed.append(ticker)
+                        continue
+
+                    if parsed.changed and parsed.max_filed is None:
+                        print(f"  ⚠️  No CORE_TAGS facts found for {ticker}")
+
+                    batch.append(CompanyResult(cik, ticker, fetched_at, parsed))
+                    batch_rows += len(parsed.fact_rows)
+                    if len(batch) >= args.batch_size or batch_rows >= args.batch_rows:
+                        flush()
+
+                flush()
+                if stage_errors:
+                    raise stage_errors[0]
+            finally:
+                stop.set()
+                for t in threads:
+                    t.join(timeout=5)
+
+        print(f"\n✅ Done. Filings attempted: {total_filings_attempted} | Facts attempted: {total_facts_attempted}")
+
+    if failed:
+        print(f"❌ {len(failed)} companies failed (rerun with --only-failed): {', '.join(failed)}")
+        return 1
+    return 0
@@ -0,0 +1,99 @@
+import argparse
+
+from .. import dirty
+from ..config import get_settings
+from ..db import get_conn
+
+def safe_div(a, b):
+    if a is None or b in (None, 0):
+        return None
+    return a / b
+
+def run(args: argparse.Namespace) -> int:
+    conn = get_conn()
+    try:
+        # Single transaction: claimed dirty marks come back if the run fails
+        with conn:
+            with conn.cursor() as cur:
+                ciks = dirty.claim_dirty(cur, dirty.RATIOS)
+                if args.incremental and not ciks:
+                    print("✅ Nothing to recompute (no dirty companies)")
+                    return 0
+
+                cur.execute(
+                    f"""
+                    SELECT
+                      cik, fiscal_year,
+                      revenues, gross_profit, operating_income, net_income,
+                      total_assets, total_equity,
+                      free_cash_flow
+                    FROM statements_annual
+                    {"WHERE cik = ANY(%s)" if args.incremental else ""}
+                    """,
+                    (ciks,) if args.incremental else None,
+                )
+                rows = cur.fetchall()
+
+            upserts = []
+            for cik, fy, rev, gp, op, ni, assets, equity, fcf in rows:
+                gross_margin = safe_div(gp, rev)
+                operating_margin = safe_div(op, rev)
+                net_margin = safe_div(ni, rev)
+
+                roa = safe_div(ni, assets)
+                roe = safe_div(ni, equity)
+                leverage = safe_div(assets, equity)
+
+                fcf_margin = safe_div(fcf, rev)
+                asset_turnover = safe_div(rev, assets)
+
+                upserts.append(
+                    (cik, fy, gross_margin, operating_margin, net_margin, roa, roe, leverage, fcf_margin, asset_turnover)
+                )
+
+            with conn.cursor() as cur:
+                cur.executemany("""
+                    INSERT INTO ratios_annual (
+                      cik, fiscal_year,
+                      gross_margin, operating_margin, net_margin,
+                      roa, roe, leverage,
+                      fcf_margin, asset_turnover
+                    )
+                    VALUES (%s,%s,%s,%s,%s,%s,%s,%s,%s,%s)
+                    ON CONFLICT (cik, fiscal_year) DO UPDATE SET
+                      gross_margin=EXCLUDED.gross_margin,
+                      operating_margin=EXCLUDED.operating_margin,
+                      net_margin=EXCLUDED.net_margin,
+                      roa=EXCLUDED.roa,
+                      roe=EXCLUDED.roe,
+                      leverage=EXCLUDED.leverage,
+                      fcf_margin=EXCLUDED.fcf_margin,
+                      asset_turnover=EXCLUDED.asset_turnover
+                """, upserts)
+
+                # Peer aggregates only need recomputing for groups these companies belong to
+                dirty.mark_dirty(cur, {u[0] for u in upserts}, dirty.ROLLUPS)
+    finally:
+        conn.close()
+
+    print(f"✅ Upserted ratios_annual rows: {len(upserts)}")
+
+    if get_settings().ratios_snapshot_path:
+        return publish_snapshot()
+    return 0
+
+def publish_snapshot() -> int:
+    from ..snapshot import write_snapshot
+
+    path = get_settings().ratios_snapshot_path
+    if not path:
+        raise ValueError("Missing RATIOS_SNAPSHOT_PATH in .env")
+
+    conn = get_conn()
+    try:
+        n = write_snapshot(conn, path)
+    finally:
+        conn.close()
+
+    print(f"✅ Published ratio snapshot ({n} rows) to {path}")
+    return 0
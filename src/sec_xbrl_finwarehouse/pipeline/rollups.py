@@ -0,0 +1,27 @@
+import argparse
+
+from .. import dirty
+from ..db import get_conn
+from ..peers import rebuild_peer_stats
+
+def run(args: argparse.Namespace) -> int:
+    conn = get_conn()
+    try:
+        # Single transaction: claimed dirty marks come back if the run fails
+        with conn:
+            with conn.cursor() as cur:
+                ciks = dirty.claim_dirty(cur, dirty.ROLLUPS)
+                groups = dirty.claim_dirty_groups(cur)
+                if args.incremental and not ciks and not groups:
+                    print("✅ Nothing to roll up (no dirty companies)")
+                    return 0
+
+                if args.incremental:
+                    n = rebuild_peer_stats(cur, ciks, groups)
+                else:
+                    n = rebuild_peer_stats(cur)
+    finally:
+        conn.close()
+
+    print(f"✅ Upserted peer_ratio_stats rows: {n}")
+    return 0
@@ -0,0 +1,194 @@
+import argparse
+import csv
+import io
+import json
+import threading
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import requests
+
+from .. import dirty
+from ..config import get_settings
+from ..db import get_conn
+from ..sec_client import SecClient
+from ..sic import sic_sector
+
+TICKER_CIK_URL = "https://www.sec.gov/files/company_tickers.json"
+
+# (cik, sic, sector, industry)
+SicRow = Tuple[str, Optional[str], Optional[str], Optional[str]]
+
+def get_ticker_cik_map(user_agent: str) -> dict:
+    r = requests.get(
+        TICKER_CIK_URL,
+        headers={"User-Agent": user_agent, "Accept": "application/json"},
+        timeout=30,
+    )
+    r.raise_for_status()
+    data = r.json()  # dict of numeric keys -> {cik_str, ticker, title}
+    out = {}
+    for _, row in data.items():
+        out[row["ticker"].upper()] = {
+            "cik": str(row["cik_str"]).zfill(10),
+            "name": row["title"],
+        }
+    return out
+
+def _copy_rows(cur, table: str, rows: Iterable[tuple]) -> None:
+    buf = io.StringIO()
+    csv.writer(buf).writerows(rows)
+    buf.seek(0)
+    cur.copy_expert(f"COPY {table} FROM STDIN WITH (FORMAT csv)", buf)
+
+def merge_companies(conn, rows: List[Tuple[str, str, str]]) -> int:
+    # One COPY into a staging table, then a single set-based merge
+    with conn.cursor() as cur:
+        cur.execute("CREATE TEMP TABLE seed_companies (cik TEXT, ticker TEXT, name TEXT) ON COMMIT DROP")
+        _copy_rows(cur, "seed_companies", rows)
+
+        # A ticker still held by another CIK would violate UNIQUE(ticker): keep the existing owner
+        cur.execute(
+            """
+            DELETE FROM seed_companies s
+            USING companies c
+            WHERE c.ticker = s.ticker AND c.cik <> s.cik
+            RETURNING s.ticker
+            """
+        )
+        for (ticker,) in cur.fetchall():
+            print(f"⚠️  Ticker {ticker} already belongs to another CIK, skipped")
+
+        cur.execute(
+            """
+            INSERT INTO companies (cik, ticker, name)
+            SELECT cik, ticker, name FROM seed_companies
+            ON CONFLICT (cik) DO UPDATE
+              SET ticker = EXCLUDED.ticker,
+                  name = EXCLUDED.name
+            """
+        )
+        n = cur.rowcount
+    conn.commit()
+    return n
+
+def _sic_row(cik: str, submissions: dict) -> SicRow:
+    sic = submissions.get("sic") or None
+    return (cik, sic, sic_sector(sic), submissions.get("sicDescription") or None)
+
+def sic_from_api(ciks: List[str], concurrency: int) -> List[SicRow]:
+    local = threading.local()
+
+    def fetch(cik: str) -> Optional[SicRow]:
+        # SecClient paces itself (~5 req/s), so concurrency=2 stays within SEC fair access
+        if not hasattr(local, "client"):
+            local.client = SecClient()
+        try:
+            return _sic_row(cik, local.client.get_submissions(cik))
+        except RuntimeError as e:
+            print(f"⚠️  {e}")
+            return None
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        return [r for r in pool.map(fetch, ciks) if r is not None]
+
+def sic_from_zip(ciks: List[str], path: str) -> List[SicRow]:
+    # Bulk archive: https://www.sec.gov/Archives/edgar/daily-index/bulkdata/submissions.zip
+    out = []
+    with zipfile.ZipFile(path) as zf:
+        names = set(zf.namelist())
+        for cik in ciks:
+            name = f"CIK{cik}.json"
+            if name in names:
+                out.append(_sic_row(cik, json.loads(zf.read(name))))
+    return out
+
+def enrich_sic(conn, ciks: List[str], concurrency: int, submissions_zip: Optional[str]) -> int:
+    """Update sic/sector/industry; returns how many companies actually changed."""
+    if submissions_zip:
+        rows = sic_from_zip(ciks, submissions_zip)
+    else:
+        rows = sic_from_api(ciks, concurrency)
+    if not rows:
+        return 0
+
+    with conn.cursor() as cur:
+        cur.execute(
+            "CREATE TEMP TABLE seed_sic (cik TEXT, sic TEXT, sector TEXT, industry TEXT) ON COMMIT DROP"
+        )
+        _copy_rows(cur, "seed_sic", rows)
+        # `o` reads the pre-update row, so RETURNING can report the groups a company left
+        cur.execute(
+            """
+            UPDATE companies c
+            SET sic = s.sic, sector = s.sector, industry = s.industry
+            FROM seed_sic s
+            JOIN companies o ON o.cik = s.cik
+            WHERE c.cik = s.cik
+              AND (c.sic, c.sector, c.industry) IS DISTINCT FROM (s.sic, s.sector, s.industry)
+            RETURNING c.cik, o.sector, o.industry
+            """
+        )
+        changed = cur.fetchall()
+
+        # Peer rollups: the new groups via the company, the old ones by name
+        dirty.mark_dirty(cur, [cik for cik, _, _ in changed], dirty.ROLLUPS)
+        dirty.mark_groups_dirty(
+            cur,
+            [("sector", s) for _, s, _ in changed if s is not None]
+            + [("industry", i) for _, _, i in changed if i is not None],
+        )
+    conn.commit()
+    return len(changed)
+
+def run(args: argparse.Namespace) -> int:
+    settings = get_settings()
+
+    if not settings.sec_user_agent:
+        raise ValueError("Missing SEC_USER_AGENT in .env")
+    if not args.all and not settings.tickers:
+        raise ValueError("Missing TICKERS in .env (comma-separated), or pass --all")
+
+    mapping = get_ticker_cik_map(settings.sec_user_agent)
+    tickers_list = list(mapping) if args.all else settings.tickers
+
+    rows = []
+    seen_ciks = {}
+    for t in tickers_list:
+        if t not in mapping:
+            print(f"⚠️  Ticker not found in SEC mapping: {t}")
+            continue
+        cik = mapping[t]["cik"]
+        # Share classes (BRK-A/BRK-B) map to one CIK and companies hold one ticker: the first wins.
+        # With --all that's the SEC file's primary ticker; with TICKERS it's the first one listed
+        if cik in seen_ciks:
+            if not args.all:
+                print(f"⚠️  Ticker {t} shares CIK {cik} with {seen_ciks[cik]}, skipped")
+            continue
+        seen_ciks[cik] = t
+        rows.append((cik, t, mapping[t]["name"]))
+
+    if not rows:
+        raise RuntimeError("No valid tickers found to insert.")
+
+    with get_conn() as conn:
+        n = merge_companies(conn, rows)
+        print(f"✅ Inserted/updated {n} companies.")
+
+        if args.enrich:
+            with conn.cursor() as cur:
+                cur.execute(
+                    f"""
+                    SELECT cik FROM companies
+                    WHERE cik = ANY(%s) {"" if args.refresh_sic else "AND sic IS NULL"}
+                    ORDER BY cik
+                    """,
+                    ([r[0] for r in rows],),
+                )
+                ciks = [r[0] for r in cur.fetchall()]
+            print(f"→ Enriching SIC for {len(ciks)} companies")
+            n = enrich_sic(conn, ciks, args.concurrency, args.submissions_zip)
+            print(f"✅ Enriched sic/sector/industry: {n} companies changed.")
+
+    return 0
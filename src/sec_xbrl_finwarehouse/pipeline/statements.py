@@ -0,0 +1,147 @@
+import argparse
+
+from .. import dirty
+from ..concepts import COMPILED
+from ..db import get_conn
+from ..fx import USD, FxTable
+from ..sic import DEFAULT, industry_group
+
+def run(args: argparse.Namespace) -> int:
+    conn = get_conn()
+    try:
+        # Single transaction: claimed dirty marks come back if the build fails
+        with conn:
+            with conn.cursor() as cur:
+                # Claimed in both modes: a full build covers every dirty company
+                ciks = dirty.claim_dirty(cur, dirty.STATEMENTS)
+            if args.incremental and not ciks:
+                print("✅ V3 nothing to rebuild (no dirty companies)")
+                return 0
+
+            cik_filter = "AND cik = ANY(%s)" if args.incremental else ""
+            cik_params = (ciks,) if args.incremental else ()
+
+            with conn.cursor() as cur:
+                # Industry group per company selects its concept overrides
+                cur.execute(
+                    f"SELECT cik, sic FROM companies WHERE true {cik_filter}",
+                    cik_params,
+                )
+                groups = {cik: industry_group(sic) for cik, sic in cur.fetchall()}
+
+                # One pass over facts for every mapped tag:
+                #   FLOW items: annual-like periods (~1 year)
+                #   STOCK items: point-in-time at FY end
+                cur.execute(
+                    f"""
+                    WITH base AS (
+                      SELECT
+                        cik,
+                        EXTRACT(YEAR FROM period_end)::int AS fiscal_year,
+                        tag,
+                        unit,
+                        period_end,
+                        value,
+                        filed
+                      FROM facts
+                      WHERE taxonomy='us-gaap'
+                        AND unit ~ '^[A-Z]{{3}}$'
+                        AND tag = ANY(%s)
+                        {cik_filter}
+                        AND form IN ('10-K', '20-F')
+                        AND period_end IS NOT NULL
+                        AND (
+                          (tag = ANY(%s)
+                           AND period_start IS NOT NULL
+                           AND (period_end - period_start) BETWEEN 330 AND 380)
+                          OR (tag = ANY(%s) AND period_start IS NULL)
+                        )
+                    ),
+                    ranked AS (
+                      SELECT *,
+                             ROW_NUMBER() OVER (
+                               PARTITION BY cik, fiscal_year, tag
+                               ORDER BY (unit = 'USD') DESC, filed DESC NULLS LAST
+                             ) AS rn
+                      FROM base
+                    )
+                    SELECT cik, fiscal_year, tag, unit, period_end, value
+                    FROM ranked
+                    WHERE rn = 1;
+                    """,
+                    (
+                        sorted(COMPILED.ingest_tags),
+                        *cik_params,
+                        list(COMPILED.flow_tags),
+                        list(COMPILED.stock_tags),
+                    ),
+                )
+                rows = cur.fetchall()
+
+                # Non-USD values convert at the period-end rate, resolved once per (currency, period_end)
+                fx = FxTable.load(cur, {r[3] for r in rows})
+                rates = {(unit, end): fx.rate(unit, end) for unit, end in {(r[3], r[4]) for r in rows}}
+
+            # Single pass: each (group, tag) resolves to a field and its fallback priority
+            n_fields = len(COMPILED.fields)
+            lookup = COMPILED.lookup
+            by_year = {}
+            missing_fx = set()
+            for cik, fy, tag, unit, end, val in rows:
+                hit = lookup.get((groups.get(cik, DEFAULT), tag))
+                if hit is None:
+                    continue
+                rate = rates[(unit, end)]
+                if rate is None:
+                    missing_fx.add((unit, end))
+                    continue
+                field, priority = hit
+                acc = by_year.get((cik, fy))
+                if acc is None:
+                    acc = by_year[(cik, fy)] = ([None] * n_fields, [len(lookup)] * n_fields, [None] * n_fields)
+                values, priorities, currencies = acc
+                if priority < priorities[field]:
+                    values[field] = val if unit == USD else val * rate
+                    priorities[field] = priority
+                    currencies[field] = unit
+
+            capex_i = COMPILED.fields.index("capex")
+            ocf_i = COMPILED.fields.index("operating_cash_flow")
+            upserts = []
+            for (cik, fy), (values, _, currencies) in by_year.items():
+                # Normalize CAPEX to positive outflow if SEC gives negative values
+                capex_raw = values[capex_i]
+                if capex_raw is not None and capex_raw < 0:
+                    values[capex_i] = -capex_raw
+
+                ocf, capex = values[ocf_i], values[capex_i]
+                fcf = None
+                if ocf is not None and capex is not None:
+                    fcf = ocf - capex
+
+                # Currencies of the values actually kept; USD convenience figures don't change what the filer reports in
+                reporting = sorted(set(currencies) - {USD, None})
+                upserts.append((cik, fy, *values, fcf, reporting[0] if reporting else USD))
+
+            with conn.cursor() as cur:
+                columns = COMPILED.fields + ("free_cash_flow", "reporting_currency")
+                cur.executemany(f"""
+                    INSERT INTO statements_annual (
+                      cik, fiscal_year, {", ".join(columns)}
+                    )
+                    VALUES (%s,%s,{",".join(["%s"] * len(columns))})
+                    ON CONFLICT (cik, fiscal_year) DO UPDATE SET
+                      {", ".join(f"{c} = EXCLUDED.{c}" for c in columns)},
+                      updated_at = now()
+                """, upserts)
+
+                # Ratios only need recomputing where statements were rebuilt
+                dirty.mark_dirty(cur, {u[0] for u in upserts}, dirty.RATIOS)
+    finally:
+        conn.close()
+
+    if missing_fx:
+        currencies = ", ".join(sorted({c for c, _ in missing_fx}))
+        print(f"⚠️  No FX rate for {len(missing_fx)} (currency, period end) pairs ({currencies}); load-fx to convert them")
+    print(f"✅ V3 upserted statements_annual rows: {len(upserts)}")
+    return 0
@@ -1,15 +1,18 @@
-import os
+import json
 import time
 from typing import Any, Dict, Optional
 
 import requests
 
+from .config import get_settings
+
 SEC_BASE = "https://data.sec.gov/api/xbrl/companyfacts/CIK{cik}.json"
+SUBMISSIONS_BASE = "https://data.sec.gov/submissions/CIK{cik}.json"
 
 
 class SecClient:
     def __init__(self, user_agent: Optional[str] = None, timeout: int = 30):
-        self.user_agent = user_agent or os.getenv("SEC_USER_AGENT")
+        self.user_agent = user_agent or get_settings().sec_user_agent
         if not self.user_agent:
             raise ValueError("Missing SEC_USER_AGENT env var (use: 'Name email@domain.com').")
 
@@ -25,16 +28,26 @@ class SecClient:
         )
 
     def get_company_facts(self, cik: str, retries: int = 3, backoff: float = 1.6) -> Dict[str, Any]:
-        cik10 = cik.zfill(10)
-        url = SEC_BASE.format(cik=cik10)
+        return json.loads(self.get_company_facts_raw(cik, retries=retries, backoff=backoff))
+
+    def get_company_facts_raw(self, cik: str, retries: int = 3, backoff: float = 1.6) -> bytes:
+        # Undecoded body, so JSON parsing can happen off the fetching thread
+        url = SEC_BASE.format(cik=cik.zfill(10))
+        return self._get_raw(url, f"company facts for CIK={cik}", retries, backoff)
+
+    def get_submissions(self, cik: str, retries: int = 3, backoff: float = 1.6) -> Dict[str, Any]:
+        # Filing history + entity metadata (sic, sicDescription, exchanges, ...)
+        url = SUBMISSIONS_BASE.format(cik=cik.zfill(10))
+        return json.loads(self._get_raw(url, f"submissions for CIK={cik}", retries, backoff))
 
+    def _get_raw(self, url: str, what: str, retries: int, backoff: float) -> bytes:
         last_err: Optional[Exception] = None
         for attempt in range(retries):
             try:
                 r = self.session.get(url, timeout=self.timeout)
                 if r.status_code == 200:
                     time.sleep(0.2)  # gentle pacing
-                    return r.json()
+                    return r.content
 
                 # retry on rate limiting / transient errors
                 if r.status_code in (429, 500, 502, 503, 504):
@@ -47,4 +60,4 @@ class SecClient:
                 last_err = e
                 time.sleep(backoff ** (attempt + 1))
 
-        raise RuntimeError(f"Failed to fetch SEC company facts for CIK={cik}: {last_err}")
+        raise RuntimeError(f"Failed to fetch SEC {what}: {last_err}")
@@ -0,0 +1,34 @@
+import csv
+import io
+import json
+from typing import Iterable, Iterator, Sequence
+
+try:  # optional: pip install -e .[fast]
+    import orjson
+except ImportError:
+    orjson = None
+
+def dumps(obj) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(",", ":")).encode()
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+CSV_MEDIA_TYPE = "text/csv; charset=utf-8"
+
+def ndjson_batches(columns: Sequence[str], batches: Iterable[Sequence[tuple]]) -> Iterator[bytes]:
+    # One chunk per batch: one object per line
+    for rows in batches:
+        yield b"".join(dumps(dict(zip(columns, row))) + b"\n" for row in rows)
+
+def csv_batches(columns: Sequence[str], batches: Iterable[Sequence[tuple]]) -> Iterator[bytes]:
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    writer.writerow(columns)
+    for rows in batches:
+        writer.writerows(rows)
+        yield buf.getvalue().encode()
+        buf.seek(0)
+        buf.truncate()
+    if buf.tell():
+        yield buf.getvalue().encode()
@@ -0,0 +1,53 @@
+from typing import Optional
+
+# SIC code classification: `companies.sector` (SIC division) and the concept registry's
+# industry groups (which select per-industry tag overrides) both derive from `companies.sic`.
+
+# SIC division ranges (first SIC code of each range -> division name), used as `sector`
+SIC_DIVISIONS = (
+    (100, "Agriculture, Forestry and Fishing"),
+    (1000, "Mining"),
+    (1500, "Construction"),
+    (1800, None),
+    (2000, "Manufacturing"),
+    (4000, "Transportation, Communications and Utilities"),
+    (5000, "Wholesale Trade"),
+    (5200, "Retail Trade"),
+    (6000, "Finance, Insurance and Real Estate"),
+    (6800, None),
+    (7000, "Services"),
+    (9000, None),
+    (9100, "Public Administration"),
+    (9730, None),
+    (9900, "Nonclassifiable"),
+)
+
+DEFAULT = "default"
+BANK = "bank"
+INSURANCE = "insurance"
+
+# SIC ranges [start, end) -> industry group
+INDUSTRY_GROUPS = (
+    (6000, 6200, BANK),       # depository and non-depository credit institutions
+    (6300, 6400, INSURANCE),  # insurance carriers
+)
+
+def sic_sector(sic: Optional[str]) -> Optional[str]:
+    if not sic or not str(sic).isdigit():
+        return None
+    code = int(sic)
+    sector = None
+    for start, name in SIC_DIVISIONS:
+        if code < start:
+            break
+        sector = name
+    return sector
+
+def industry_group(sic: Optional[str]) -> str:
+    if not sic or not str(sic).isdigit():
+        return DEFAULT
+    code = int(sic)
+    for start, end, group in INDUSTRY_GROUPS:
+        if start <= code < end:
+            return group
+    return DEFAULT
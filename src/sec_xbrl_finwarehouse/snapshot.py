@@ -0,0 +1,259 @@
+import json
+import logging
+import mmap
+import os
+import struct
+import sys
+import threading
+import time
+from array import array
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from .peers import RATIO_METRICS
+
+logger = logging.getLogger(__name__)
+
+# File layout (little-endian):
+#   MAGIC (8 bytes) | header length (uint64) | JSON header | padding | column arrays (8-byte aligned)
+# Rows are sorted by (company, fiscal_year DESC), so one company's rows are contiguous.
+MAGIC = b"SXFWSNP1"
+
+STATEMENT_COLUMNS = (
+    "revenues",
+    "gross_profit",
+    "operating_income",
+    "net_income",
+    "total_assets",
+    "total_liabilities",
+    "total_equity",
+    "operating_cash_flow",
+    "capex",
+    "free_cash_flow",
+)
+
+FLOAT_COLUMNS = RATIO_METRICS + STATEMENT_COLUMNS
+
+
+def _align(n: int) -> int:
+    return (n + 7) & ~7
+
+
+def write_snapshot(conn, path: str) -> int:
+    """Publish ratios_annual + statements_annual as a columnar file, atomically replacing `path`."""
+    with conn.cursor() as cur:
+        cur.execute(
+            f"""
+            SELECT r.cik, c.ticker, c.name, r.fiscal_year,
+                   {", ".join(f"r.{m}" for m in RATIO_METRICS)},
+                   {", ".join(f"s.{m}" for m in STATEMENT_COLUMNS)}
+            FROM ratios_annual r
+            JOIN companies c ON c.cik = r.cik
+            LEFT JOIN statements_annual s ON s.cik = r.cik AND s.fiscal_year = r.fiscal_year
+            ORDER BY c.ticker, r.fiscal_year DESC
+            """
+        )
+        rows = cur.fetchall()
+
+    companies: List[List[Optional[str]]] = []
+    company_idx: Dict[str, int] = {}
+    cols: Dict[str, array] = {"company": array("i"), "fiscal_year": array("i")}
+    for name in FLOAT_COLUMNS:
+        cols[name] = array("d")
+
+    nan = float("nan")
+    for cik, ticker, name, fy, *values in rows:
+        if cik not in company_idx:
+            company_idx[cik] = len(companies)
+            companies.append([cik, ticker, name])
+        cols["company"].append(company_idx[cik])
+        cols["fiscal_year"].append(fy)
+        for col, v in zip(FLOAT_COLUMNS, values):
+            cols[col].append(nan if v is None else float(v))  # NUMERIC arrives as Decimal
+
+    header: Dict[str, Any] = {
+        "version": 1,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "n_rows": len(rows),
+        "companies": companies,
+        "columns": {},
+    }
+    # Offsets depend on the header size, which depends on the offsets: reserve room, then fill in
+    layout = [(name, "<i4" if arr.typecode == "i" else "<f8", arr) for name, arr in cols.items()]
+    offset = 0
+    for name, dtype, arr in layout:
+        header["columns"][name] = {"dtype": dtype, "offset": offset}
+        offset = _align(offset + len(arr) * arr.itemsize)
+    header_bytes = json.dumps(header, separators=(",", ":")).encode()
+    data_start = _align(len(MAGIC) + 8 + len(header_bytes))
+
+    tmp = f"{path}.tmp-{os.getpid()}"
+    with open(tmp, "wb") as f:
+        f.write(MAGIC)
+        f.write(struct.pack("<Q", len(header_bytes)))
+        f.write(header_bytes)
+        f.write(b"\0" * (data_start - f.tell()))
+        for name, _, arr in layout:
+            if sys.byteorder == "big":
+                arr = array(arr.typecode, arr)
+                arr.byteswap()
+            f.write(arr.tobytes())
+            f.write(b"\0" * (data_start + _align(f.tell() - data_start) - f.tell()))
+        f.flush()
+        os.fsync(f.fileno())
+    # Readers holding the old mapping keep using it; new opens see the new file
+    os.replace(tmp, path)
+    return len(rows)
+
+
+class RatioSnapshot:
+    """Read-only, memory-mapped view of a snapshot file (numpy arrays over shared pages)."""
+
+    def __init__(self, path: str):
+        import numpy as np
+
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if self._mm[: len(MAGIC)] != MAGIC:
+            raise ValueError(f"Not a ratio snapshot: {path}")
+        (header_len,) = struct.unpack_from("<Q", self._mm, len(MAGIC))
+        header_start = len(MAGIC) + 8
+        header = json.loads(self._mm[header_start : header_start + header_len])
+        data_start = _align(header_start + header_len)
+
+        self.created_at: str = header["created_at"]
+        self.n_rows: int = header["n_rows"]
+        self.companies: List[Tuple[str, str, Optional[str]]] = [tuple(c) for c in header["companies"]]
+        self._by_cik = {c[0]: i for i, c in enumerate(self.companies)}
+        self._by_ticker = {c[1]: i for i, c in enumerate(self.companies)}
+
+        self.cols: Dict[str, Any] = {}
+        for name, spec in header["columns"].items():
+            self.cols[name] = np.frombuffer(
+                self._mm, dtype=spec["dtype"], count=self.n_rows, offset=data_start + spec["offset"]
+            )
+
+    def company_rows(self, cik: str) -> Optional[slice]:
+        import numpy as np
+
+        i = self._by_cik.get(cik)
+        if i is None:
+            return None
+        company = self.cols["company"]
+        return slice(int(np.searchsorted(company, i, "left")), int(np.searchsorted(company, i, "right")))
+
+    def ratios(self, cik: str, limit: Optional[int]) -> Optional[List[tuple]]:
+        rows = self.company_rows(cik)
+        if rows is None:
+            return None
+        if limit is not None:
+            rows = slice(rows.start, min(rows.stop, rows.start + limit))  # already fiscal_year DESC
+        return self._tuples(rows, ("fiscal_year",) + RATIO_METRICS)
+
+    def screener_indices(
+        self,
+        year: Optional[int],
+        min_roe: Optional[float],
+        min_fcf_margin: Optional[float],
+        min_net_margin: Optional[float],
+        limit: Optional[int],
+    ):
+        """Row indices matching the screener filters, in screener order."""
+        import numpy as np
+
+        c = self.cols
+        mask = np.ones(self.n_rows, dtype=bool)
+        if year is not None:
+            mask &= c["fiscal_year"] == year
+        # NaN (SQL NULL) compares False, matching the SQL filters
+        if min_roe is not None:
+            mask &= c["roe"] >= min_roe
+        if min_fcf_margin is not None:
+            mask &= c["fcf_margin"] >= min_fcf_margin
+        if min_net_margin is not None:
+            mask &= c["net_margin"] >= min_net_margin
+
+        idx = np.flatnonzero(mask)
+        # ORDER BY fiscal_year DESC, roe DESC NULLS LAST
+        roe_key = -c["roe"][idx]
+        roe_key[np.isnan(roe_key)] = np.inf
+        idx = idx[np.lexsort((roe_key, -c["fiscal_year"][idx]))]
+        return idx if limit is None else idx[:limit]
+
+    def screener_rows(self, idx) -> List[tuple]:
+        """(ticker, name, fiscal_year, roe, fcf_margin, net_margin) for the given row indices."""
+        c = self.cols
+        out = []
+        for i, fy, roe, fcfm, nm in zip(
+            c["company"][idx].tolist(),
+            c["fiscal_year"][idx].tolist(),
+            self._nullable(c["roe"][idx]),
+            self._nullable(c["fcf_margin"][idx]),
+            self._nullable(c["net_margin"][idx]),
+        ):
+            _, ticker, name = self.companies[i]
+            out.append((ticker, name, fy, roe, fcfm, nm))
+        return out
+
+    def screener(
+        self,
+        year: Optional[int],
+        min_roe: Optional[float],
+        min_fcf_margin: Optional[float],
+        min_net_margin: Optional[float],
+        limit: Optional[int],
+    ) -> List[tuple]:
+        return self.screener_rows(self.screener_indices(year, min_roe, min_fcf_margin, min_net_margin, limit))
+
+    def _tuples(self, rows, columns) -> List[tuple]:
+        return list(zip(*(self._nullable(self.cols[name][rows]) for name in columns)))
+
+    @staticmethod
+    def _nullable(values) -> list:
+        # NaN -> None, numpy scalars -> Python numbers (JSON-serializable)
+        return [None if v != v else v for v in values.tolist()]
+
+
+class SnapshotHolder:
+    """Keeps the current RatioSnapshot open and swaps it when the file is replaced."""
+
+    def __init__(self, path: Optional[str], check_interval: float = 1.0):
+        self._path = path
+        self._check_interval = check_interval
+        self._lock = threading.Lock()
+        self._snap: Optional[RatioSnapshot] = None
+        self._file_id: Optional[Tuple[int, int]] = None
+        self._checked_at = 0.0
+        self._disabled = path is None
+
+    def get(self) -> Optional[RatioSnapshot]:
+        if self._disabled:
+            return None
+        if time.monotonic() - self._checked_at >= self._check_interval:
+            with self._lock:
+                if time.monotonic() - self._checked_at >= self._check_interval:
+                    self._reload_if_changed()
+                    self._checked_at = time.monotonic()
+        return self._snap
+
+    def _reload_if_changed(self) -> None:
+        try:
+            st = os.stat(self._path)
+        except FileNotFoundError:
+            self._snap, self._file_id = None, None
+            return
+
+        file_id = (st.st_ino, st.st_mtime_ns)
+        if file_id == self._file_id:
+            return
+        try:
+            self._snap = RatioSnapshot(self._path)
+            self._file_id = file_id
+        except ImportError:
+            logger.warning("numpy is not installed; serving ratios from Postgres instead of the snapshot")
+            self._disabled = True
+            self._snap = None
+        except (OSError, ValueError) as e:
+            logger.warning("could not open ratio snapshot %s: %s", self._path, e)
+            self._snap = None
@@ -0,0 +1,101 @@
+import bisect
+import threading
+import time
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+
+from .config import get_settings
+from .db import get_conn
+
+
+class Company(NamedTuple):
+    cik: str
+    ticker: str
+    name: Optional[str]
+    sector: Optional[str]
+    industry: Optional[str]
+
+
+class _Snapshot(NamedTuple):
+    by_ticker: Dict[str, Company]
+    by_cik: Dict[str, Company]
+    tickers: List[str]                # sorted, for prefix search
+    names: List[Tuple[str, str]]      # sorted (lower(name), ticker)
+    loaded_at: float
+
+
+def load_companies() -> List[Company]:
+    with get_conn() as conn:
+        with conn.cursor() as cur:
+            cur.execute("SELECT cik, ticker, name, sector, industry FROM companies")
+            rows = cur.fetchall()
+    return [Company(*r) for r in rows]
+
+
+class SymbolIndex:
+    """In-memory ticker <-> CIK <-> name index, reloaded from `companies` on a TTL."""
+
+    def __init__(
+        self,
+        loader: Callable[[], List[Company]] = load_companies,
+        ttl: Optional[float] = None,
+        miss_refresh_interval: float = 30.0,
+    ):
+        self._loader = loader
+        self._ttl = get_settings().symbol_index_ttl if ttl is None else ttl
+        self._miss_refresh_interval = miss_refresh_interval
+        self._lock = threading.Lock()
+        self._snap: Optional[_Snapshot] = None
+
+    def refresh(self) -> None:
+        companies = self._loader()
+        by_ticker = {c.ticker: c for c in companies}
+        snap = _Snapshot(
+            by_ticker=by_ticker,
+            by_cik={c.cik: c for c in companies},
+            tickers=sorted(by_ticker),
+            names=sorted(((c.name or "").lower(), c.ticker) for c in companies),
+            loaded_at=time.monotonic(),
+        )
+        # Readers never lock: they grab whichever snapshot is current
+        self._snap = snap
+
+    def _snapshot(self, max_age: Optional[float] = None) -> _Snapshot:
+        max_age = self._ttl if max_age is None else max_age
+        snap = self._snap
+        if snap is None or time.monotonic() - snap.loaded_at > max_age:
+            with self._lock:
+                snap = self._snap
+                if snap is None or time.monotonic() - snap.loaded_at > max_age:
+                    self.refresh()
+                    snap = self._snap
+        return snap
+
+    def get(self, ticker: str) -> Optional[Company]:
+        c = self._snapshot().by_ticker.get(ticker.upper())
+        if c is None:
+            # Newly seeded tickers show up without waiting for the TTL (bounded DB hits on misses)
+            c = self._snapshot(self._miss_refresh_interval).by_ticker.get(ticker.upper())
+        return c
+
+    def get_by_cik(self, cik: str) -> Optional[Company]:
+        return self._snapshot().by_cik.get(cik.zfill(10))
+
+    def search(self, prefix: str, limit: int = 10) -> List[Company]:
+        snap = self._snapshot()
+        out: Dict[str, Company] = {}
+
+        # Ticker prefix matches first, then company-name prefix matches
+        p = prefix.upper()
+        i = bisect.bisect_left(snap.tickers, p)
+        while i < len(snap.tickers) and len(out) < limit and snap.tickers[i].startswith(p):
+            out[snap.tickers[i]] = snap.by_ticker[snap.tickers[i]]
+            i += 1
+
+        p = prefix.lower()
+        i = bisect.bisect_left(snap.names, (p, ""))
+        while i < len(snap.names) and len(out) < limit and snap.names[i][0].startswith(p):
+            ticker = snap.names[i][1]
+            out.setdefault(ticker, snap.by_ticker[ticker])
+            i += 1
+
+        return list(out.values())
@@ -0,0 +1,125 @@
+import hashlib
+import json
+import re
+from datetime import date
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+from .concepts import COMPILED
+
+# Every tag the concept registry can map (all industry groups); nothing else is ingested
+CORE_TAGS = COMPILED.ingest_tags
+
+# Bump when extraction logic changes, so change detection re-sends full histories
+EXTRACT_VERSION = 2
+EXTRACT_KEY = hashlib.sha256(json.dumps([EXTRACT_VERSION, sorted(CORE_TAGS)]).encode()).hexdigest()[:16]
+
+# Monetary units are ISO 4217 codes ("USD", "EUR", "JPY"); per-share ("USD/shares"), "shares", "pure" are skipped
+MONETARY_UNIT = re.compile(r"^[A-Z]{3}$")
+
+FilingRow = Tuple[str, str, Optional[str], Optional[date], Optional[date], Optional[int], Optional[str]]
+FactRow = Tuple[str, str, str, str, Optional[date], Optional[date], float, Optional[str], Optional[str], Optional[date], Optional[str]]
+
+def _d(s: Optional[str]) -> Optional[date]:
+    return date.fromisoformat(s) if s else None
+
+def extract_filings_and_facts(company_json: Dict[str, Any], cik10: str) -> Tuple[List[FilingRow], List[FactRow]]:
+    facts = company_json.get("facts", {})
+    us_gaap = facts.get("us-gaap", {})
+
+    filings_map: dict[str, FilingRow] = {}
+    fact_rows: List[FactRow] = []
+
+    for tag, payload in us_gaap.items():
+        if tag not in CORE_TAGS:
+            continue
+
+        units = payload.get("units", {})
+        for unit, items in units.items():
+            if not MONETARY_UNIT.match(unit):
+                continue
+            for item in items:
+                val = item.get("val")
+                if val is None:
+                    continue
+
+                accn = item.get("accn")  # accession number
+                form = item.get("form")
+                filed = _d(item.get("filed"))
+                period_start = _d(item.get("start"))
+                period_end = _d(item.get("end"))
+                frame = item.get("frame")
+                fy = item.get("fy")
+                fp = item.get("fp")
+
+                # 1) Prepare filings row (so FK in facts won't fail)
+                if accn:
+                    # filings table: accession_no, cik, form, filing_date, report_date, fiscal_year, fiscal_period
+                    # report_date: we use period_end as a reasonable proxy in V1
+                    filings_map[accn] = (accn, cik10, form, filed, period_end, int(fy) if fy is not None else None, fp)
+
+                # 2) Prepare fact row
+                fact_rows.append(
+                    (
+                        cik10,
+                        "us-gaap",
+                        tag,
+                        unit,
+                        period_start,
+                        period_end,
+                        float(val),
+                        accn,
+                        form,
+                        filed,
+                        frame,
+                    )
+                )
+
+    return list(filings_map.values()), fact_rows
+
+def core_facts_hash(company_json: Dict[str, Any]) -> str:
+    # Fingerprint of the CORE_TAGS subset only: unrelated tags changing doesn't count
+    us_gaap = company_json.get("facts", {}).get("us-gaap", {})
+    subset = {tag: us_gaap[tag].get("units", {}) for tag in sorted(CORE_TAGS) if tag in us_gaap}
+    return hashlib.sha256(json.dumps(subset, sort_keys=True, separators=(",", ":")).encode()).hexdigest()
+
+class PrevState(NamedTuple):
+    payload_hash: Optional[str]
+    facts_hash: Optional[str]
+    max_filed: Optional[date]
+    extract_key: Optional[str]
+
+class ParsedCompany(NamedTuple):
+    payload_hash: str
+    facts_hash: Optional[str]
+    max_filed: Optional[date]
+    changed: bool
+    filing_rows: List[FilingRow]   # delta to write (everything without a comparable PrevState)
+    fact_rows: List[FactRow]
+    n_filings: Optional[int]       # full extraction size; None when unchanged (not re-extracted)
+    n_facts: Optional[int]
+
+def parse_company_facts(raw: bytes, cik10: str, prev: Optional[PrevState] = None) -> ParsedCompany:
+    # Top-level so it can run in a process pool (JSON decoding is the CPU-heavy part)
+    payload_hash = hashlib.sha256(raw).hexdigest()
+    comparable = prev is not None and prev.extract_key == EXTRACT_KEY
+
+    # Identical payload: skip even the JSON decode
+    if comparable and prev.payload_hash == payload_hash:
+        return ParsedCompany(payload_hash, prev.facts_hash, prev.max_filed, False, [], [], None, None)
+
+    company_json = json.loads(raw)
+    facts_hash = core_facts_hash(company_json)
+    if comparable and prev.facts_hash == facts_hash:
+        return ParsedCompany(payload_hash, facts_hash, prev.max_filed, False, [], [], None, None)
+
+    filing_rows, fact_rows = extract_filings_and_facts(company_json, cik10)
+    max_filed = max((r[9] for r in fact_rows if r[9] is not None), default=None)
+    n_filings, n_facts = len(filing_rows), len(fact_rows)
+
+    # Facts are append-only per filing: only rows filed on/after the last seen date can be new
+    if comparable and prev.max_filed is not None:
+        fact_rows = [r for r in fact_rows if r[9] is None or r[9] >= prev.max_filed]
+        accns = {r[7] for r in fact_rows}
+        filing_rows = [f for f in filing_rows if f[0] in accns]
+
+    return ParsedCompany(payload_hash, facts_hash, max_filed, True, filing_rows, fact_rows, n_filings, n_facts)